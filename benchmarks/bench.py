@@ -0,0 +1,212 @@
+"""
+Benchmarks of the parsing, conversion and filtering hot paths.
+
+    python benchmarks/bench.py                        # run and report
+    python benchmarks/bench.py --save baseline.json   # record a baseline
+    python benchmarks/bench.py --compare benchmarks/baseline.json
+
+Every benchmark calls one function over a list of seeded synthetic inputs
+(see `workloads.py`) and reports ops/sec, per-call latency percentiles and
+the peak memory allocated during one pass (measured separately, with
+tracemalloc). `--compare` exits with status 1 if a benchmark is slower or
+allocates more than the baseline, beyond `--tolerance`.
+Baselines are only comparable on the same machine and Python version.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import workloads  # noqa: E402
+from unified_range import api, cache, utils  # noqa: E402
+from unified_range.models import UnifiedVersionRange  # noqa: E402
+
+PERCENTILES = (50, 90, 99)
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # returns the function and the inputs it is called with
+    setup: Callable[[], Tuple[Callable, list]]
+
+
+class Result(NamedTuple):
+    ops_per_sec: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    peak_kib: float
+
+
+def _create_from_spec(restrictions: int, count: int):
+    versions = workloads.version_list(max(restrictions * 4, 100))
+    specs = [workloads.unified_spec(versions, restrictions, seed)
+             for seed in range(count)]
+    return UnifiedVersionRange.create_from_spec, specs
+
+
+def _create_from_semver():
+    versions = workloads.version_list(2000)
+    ranges = [rng for rng in workloads.mixed_ranges(versions, 400)
+              if not utils.is_unified_range(rng)]
+    return utils.create_from_semver, ranges
+
+
+def _transform_to_semver():
+    versions = workloads.version_list(2000)
+    specs = [workloads.unified_spec(versions, seed % 5 + 1, seed)
+             for seed in range(300)]
+    return lambda spec: utils.transform_to_semver(spec, ", "), specs
+
+
+def _not_included_versions(versions_count: int, ranges_count: int):
+    versions = workloads.version_list(versions_count)
+    ranges = [api.unified_range(spec) for spec in
+              (workloads.unified_spec(versions, 3, seed)
+               for seed in range(ranges_count))]
+    return lambda rngs: utils.not_included_versions(versions, rngs), [ranges]
+
+
+def _filter_versions(versions_count: int, ranges_count: int):
+    versions = workloads.version_list(versions_count)
+    ranges = workloads.mixed_ranges(versions, ranges_count, sugar=False)
+
+    def _filter(rngs):
+        # parse every call, like a service with a cold cache
+        cache.clear()
+        return api.filter_versions(versions, rngs)
+    return _filter, [ranges]
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("create_from_spec[1]", lambda: _create_from_spec(1, 500)),
+    Benchmark("create_from_spec[50]", lambda: _create_from_spec(50, 50)),
+    Benchmark("create_from_semver[mixed]", _create_from_semver),
+    Benchmark("transform_to_semver", _transform_to_semver),
+    Benchmark("not_included_versions[10k,1]",
+              lambda: _not_included_versions(10_000, 1)),
+    Benchmark("not_included_versions[50k,500]",
+              lambda: _not_included_versions(50_000, 500)),
+    Benchmark("filter_versions[10k,50]",
+              lambda: _filter_versions(10_000, 50)),
+    Benchmark("filter_versions[50k,500]",
+              lambda: _filter_versions(50_000, 500)),
+]
+
+
+def _percentile(ordered: List[float], percentile: int) -> float:
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run_benchmark(benchmark: Benchmark, min_time: float) -> Result:
+    """
+    Run a benchmark until it ran at least `min_time` seconds (and at
+    least one pass over its inputs).
+    """
+    func, inputs = benchmark.setup()
+    # warm up, also fills the version key and parse caches
+    for arg in inputs:
+        func(arg)
+
+    timer = time.perf_counter
+    latencies: List[float] = []
+    gc.collect()
+    started = timer()
+    while True:
+        for arg in inputs:
+            call_started = timer()
+            func(arg)
+            latencies.append(timer() - call_started)
+        if timer() - started >= min_time:
+            break
+    total = sum(latencies)
+
+    tracemalloc.start()
+    for arg in inputs:
+        func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    p50, p90, p99 = (_percentile(latencies, p) * 1e6 for p in PERCENTILES)
+    return Result(len(latencies) / total, p50, p90, p99, peak / 1024)
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, dict],
+            tolerance: float) -> List[str]:
+    """
+    Return the regressions of results against the baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        min_ops = expected["ops_per_sec"] * (1 - tolerance)
+        if result.ops_per_sec < min_ops:
+            regressions.append(
+                f"{name}: {result.ops_per_sec:,.1f} ops/sec, baseline "
+                f"{expected['ops_per_sec']:,.1f}")
+        max_peak = expected["peak_kib"] * (1 + tolerance)
+        if result.peak_kib > max_peak:
+            regressions.append(
+                f"{name}: peak {result.peak_kib:,.1f} KiB, baseline "
+                f"{expected['peak_kib']:,.1f}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--filter", default="",
+                        help="run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="seconds to run every benchmark")
+    parser.add_argument("--save", help="write the results to a baseline file")
+    parser.add_argument("--compare", help="baseline file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown / memory growth ratio")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Result] = {}
+    print(f"{'benchmark':<32}{'ops/sec':>12}{'p50 us':>12}{'p90 us':>12}"
+          f"{'p99 us':>12}{'peak KiB':>12}")
+    for benchmark in BENCHMARKS:
+        if args.filter not in benchmark.name:
+            continue
+        result = run_benchmark(benchmark, args.min_time)
+        results[benchmark.name] = result
+        print(f"{benchmark.name:<32}{result.ops_per_sec:>12,.1f}"
+              f"{result.p50_us:>12,.1f}{result.p90_us:>12,.1f}"
+              f"{result.p99_us:>12,.1f}{result.peak_kib:>12,.1f}")
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "benchmarks": {name: result._asdict()
+                               for name, result in results.items()},
+            }, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline["benchmarks"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
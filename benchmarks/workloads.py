@@ -0,0 +1,122 @@
+"""
+Synthetic, seeded workloads for the benchmarks.
+
+Version lists look like real package histories (mostly patch releases,
+some minor/major bumps and pre-releases), and ranges are built from the
+versions of the list, so they can be filtered against it.
+"""
+import random
+from typing import List
+
+STYLES = ("npm", "ruby", "composer", "maven")
+
+
+def version_list(count: int, seed: int = 0) -> List[str]:
+    """
+    Return `count` ascending semver versions.
+    """
+    rnd = random.Random(seed)
+    major, minor, patch = 0, 1, 0
+    versions = []
+    while len(versions) < count:
+        bump = rnd.random()
+        if bump < 0.02:
+            major, minor, patch = major + 1, 0, 0
+        elif bump < 0.15:
+            minor, patch = minor + 1, 0
+        else:
+            patch += 1
+        if rnd.random() < 0.05:
+            for i in range(1, rnd.randint(2, 4)):
+                versions.append(f"{major}.{minor}.{patch}-rc.{i}")
+        versions.append(f"{major}.{minor}.{patch}")
+    return versions[:count]
+
+
+def _bounds(versions: List[str], count: int, rnd: random.Random) \
+        -> List[List[str]]:
+    """
+    Return `count` sorted, distinct [lower, upper] version pairs.
+    """
+    picks = sorted(rnd.sample(range(len(versions)), min(count * 2,
+                                                        len(versions))))
+    return [[versions[picks[i]], versions[picks[i + 1]]]
+            for i in range(0, len(picks) - 1, 2)]
+
+
+def unified_spec(versions: List[str], restrictions: int,
+                 seed: int = 0) -> str:
+    """
+    Return a unified spec with up to `restrictions` disjoint restrictions,
+    with a mix of bracket kinds, exact versions and unbounded ends.
+    """
+    rnd = random.Random(seed)
+    parts = []
+    pairs = _bounds(versions, restrictions, rnd)
+    for i, (lower, upper) in enumerate(pairs):
+        kind = rnd.random()
+        if kind < 0.1:
+            parts.append(f"[{lower}]")
+            continue
+        if i == 0 and kind < 0.2:
+            lower = ""
+        if i == len(pairs) - 1 and kind > 0.9:
+            upper = ""
+        left = "[" if rnd.random() < 0.7 else "("
+        right = ")" if rnd.random() < 0.7 else "]"
+        if not lower:
+            left = "("
+        if not upper:
+            right = ")"
+        parts.append(f"{left}{lower},{upper}{right}")
+    return ",".join(parts)
+
+
+def semver_range(versions: List[str], style: str, seed: int = 0,
+                 sugar: bool = True) -> str:
+    """
+    Return a semver range in an ecosystem's style, with 1-3 alternatives.
+    :param sugar: use `^`, `~` and `~>` ranges, their upper bounds may not
+        be part of versions.
+    """
+    rnd = random.Random(seed)
+    alternatives = []
+    for lower, upper in _bounds(versions, rnd.randint(1, 3), rnd):
+        kind = rnd.random() if sugar else 1
+        if style == "npm":
+            if kind < 0.3:
+                alternatives.append(f"^{lower}")
+            elif kind < 0.5:
+                alternatives.append(f"~{lower}")
+            else:
+                alternatives.append(f">={lower} <{upper}")
+        elif style == "ruby":
+            if kind < 0.3:
+                alternatives.append(f"~> {lower}")
+            else:
+                alternatives.append(f">= {lower}, < {upper}")
+        elif style == "composer":
+            alternatives.append(f">={lower},<{upper}")
+        else:
+            raise ValueError(f"Unknown semver style: {style}")
+    separator = " | " if style == "composer" else " || "
+    return separator.join(alternatives)
+
+
+def mixed_ranges(versions: List[str], count: int, seed: int = 0,
+                 sugar: bool = True) -> List[str]:
+    """
+    Return `count` ranges in a mix of npm, ruby, composer and maven styles.
+    """
+    rnd = random.Random(seed)
+    ranges = []
+    for i in range(count):
+        style = STYLES[i % len(STYLES)]
+        range_seed = rnd.randrange(2 ** 32)
+        if style == "maven":
+            ranges.append(unified_spec(versions, rnd.randint(1, 3),
+                                       seed=range_seed))
+        else:
+            ranges.append(semver_range(versions, style, seed=range_seed,
+                                       sugar=sugar))
+    return ranges
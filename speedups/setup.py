@@ -0,0 +1,32 @@
+"""
+unified-range-speedups - the optional compiled kernels of unified-range.
+
+The kernels are their own (platform specific) distribution, so the
+unified-range wheel stays pure python. `unified_range.speedups` uses them
+when this distribution is installed:
+
+    pip install unified-range-speedups
+
+or, from a checkout (needs Cython and a C compiler):
+
+    pip install ./speedups
+"""
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# released together with unified-range, keep in sync with its version
+VERSION = "0.1.1"
+
+setup(
+    name="unified-range-speedups",
+    version=VERSION,
+    description="Compiled kernels of unified-range",
+    author="Snyk",
+    license="MIT License",
+    url="https://github.com/snyk/unified-range",
+    python_requires=">=3.6",
+    install_requires=[f"unified-range=={VERSION}"],
+    ext_modules=cythonize(
+        [Extension("unified_range_speedups", ["unified_range_speedups.pyx"])],
+        quiet=True),
+)
@@ -0,0 +1,254 @@
+# cython: language_level=3
+"""
+Compiled parse and filter kernels of unified-range, see
+`unified_range.speedups`.
+
+Every kernel is a character level (or typed) implementation of the pure
+python kernel of the same name and must behave the same - same results,
+same errors with the same messages.
+"""
+from cpython.unicode cimport Py_UNICODE_ISSPACE
+
+
+def lex_unified(str spec):
+    """
+    `dialects.lex_unified`.
+    """
+    cdef str process = spec.strip()
+    cdef Py_ssize_t offset = len(spec) - len(spec.lstrip())
+    cdef Py_ssize_t n = len(process)
+    cdef Py_ssize_t pos = 0, close
+    cdef Py_UCS4 c
+
+    if not process.startswith(("(", "[")) and not process.endswith(
+            (")", "]")):
+        raise ValueError("Recommended Version is currently not supported.")
+    while pos < n and (process[pos] == "[" or process[pos] == "("):
+        # up to the first closing bracket
+        close = pos + 1
+        while close < n:
+            c = process[close]
+            if c == "]" or c == ")":
+                break
+            close += 1
+        if close == n:
+            raise ValueError("Unbounded range: {} (at position {})".format(
+                spec, offset + pos))
+        yield (process[pos:close + 1], process[pos] == "[",
+               process[pos + 1:close], process[close] == "]")
+        # the separator, optional comma and spaces
+        pos = close + 1
+        while pos < n and Py_UNICODE_ISSPACE(process[pos]):
+            pos += 1
+        if pos < n and process[pos] == ",":
+            pos += 1
+            while pos < n and Py_UNICODE_ISSPACE(process[pos]):
+                pos += 1
+    if pos < n:
+        if pos > 0:
+            raise ValueError(
+                "Only fully-qualified sets allowed in multiple set scenario: {} (at position {})".format(
+                    spec, offset + pos))
+        else:
+            yield None, False, process, False
+
+
+cdef inline bint _is_version_char(Py_UCS4 c):
+    return not (Py_UNICODE_ISSPACE(c) or c == "," or c == "|" or c == "<"
+                or c == ">" or c == "=" or c == "^" or c == "~")
+
+
+cdef inline Py_ssize_t _operator_end(str semver, Py_ssize_t pos,
+                                     Py_ssize_t n):
+    """
+    Return the end of the operator at pos, pos if there is none.
+    """
+    cdef Py_UCS4 c = semver[pos]
+    if c == "~":
+        if pos + 1 < n and semver[pos + 1] == ">":
+            return pos + 2
+        return pos + 1
+    if c == "<" or c == ">":
+        if pos + 1 < n and semver[pos + 1] == "=":
+            return pos + 2
+        return pos + 1
+    if c == "=" or c == "^":
+        return pos + 1
+    return pos
+
+
+def lex_semver(str semver):
+    """
+    `dialects.lex_semver`.
+    """
+    cdef list alternatives = [[]]
+    cdef list comparators = alternatives[0]
+    cdef bint hyphen = False, follows_comparator
+    # end of the previous comparator, -1 after a separator
+    cdef Py_ssize_t last_end = -1
+    cdef Py_ssize_t n = len(semver)
+    cdef Py_ssize_t start = 0, pos, op_end, version_start, version_end
+    cdef Py_UCS4 c
+    cdef str version
+    cdef str op
+
+    while True:
+        pos = start
+        while pos < n and Py_UNICODE_ISSPACE(semver[pos]):
+            pos += 1
+        if pos == n:
+            break
+        c = semver[pos]
+        if c == "|" or c == ",":
+            if hyphen:
+                raise ValueError(
+                    f"Invalid semver range: {semver} (operator without version)")
+            if c == "|":
+                comparators = []
+                alternatives.append(comparators)
+                if pos + 1 < n and semver[pos + 1] == "|":
+                    pos += 1
+            last_end = -1
+            start = pos + 1
+            continue
+
+        op_end = _operator_end(semver, pos, n)
+        version_start = op_end
+        while version_start < n and Py_UNICODE_ISSPACE(semver[version_start]):
+            version_start += 1
+        version_end = version_start
+        while version_end < n and _is_version_char(semver[version_end]):
+            version_end += 1
+        if version_end == version_start:
+            # an operator without a version
+            raise ValueError(
+                f"Invalid semver range: {semver} (operator without version)")
+
+        op = semver[pos:op_end] if op_end > pos else None
+        version = semver[version_start:version_end]
+        if op is not None and pos == last_end:
+            if "<" in op or ">" in op:
+                raise ValueError(
+                    "semver range contains </> more than one time.")
+            raise ValueError(
+                f"Invalid semver range: {semver} (at position {start})")
+        follows_comparator = op is None and last_end >= 0
+        last_end = version_end
+        start = version_end
+        if hyphen:
+            if version == "-":
+                # `1.0 - - 2.0`
+                raise ValueError(
+                    f"Invalid semver range: {semver} (hyphen without version)")
+            comparators.append(("--", version))
+            hyphen = False
+        elif follows_comparator and comparators[-1][0] is not None and \
+                comparators[-1][0] != "-":
+            # text after a comparator belongs to its version -
+            # `<6.19 .0`, `<5.2.5 final`
+            comparators[-1] = (comparators[-1][0],
+                               comparators[-1][1] + version)
+        elif follows_comparator and version == "-" and \
+                semver[last_end:last_end + 1] in ("", " ", "\t"):
+            comparators[-1] = ("-", comparators[-1][1])
+            hyphen = True
+        else:
+            if op is None and version == "-":
+                # `- 1.0`, `1.0 -,2.0`
+                raise ValueError(
+                    f"Invalid semver range: {semver} (hyphen without version)")
+            if version[0] in "vV" and version[1:2].isdigit() and \
+                    op not in ("<", "<=", ">", ">="):
+                # `=v1.2.3`, `^v1.2.3`, comparison bounds are kept as
+                # is since they have to match the versions list
+                version = version[1:]
+            comparators.append((op, version))
+    if hyphen:
+        raise ValueError(
+            f"Invalid semver range: {semver} (operator without version)")
+    return alternatives
+
+
+def version_positions(versions):
+    """
+    `VersionIndex` positions - version -> position of its first occurrence.
+    """
+    cdef dict positions = {}
+    cdef Py_ssize_t i = 0
+    for version in versions:
+        positions.setdefault(version, i)
+        i += 1
+    return positions
+
+
+cdef inline Py_ssize_t _position(dict positions, object version,
+                                 object version_index) except -1:
+    position = positions.get(version)
+    if position is None:
+        raise ValueError(
+            f"Version {version} couldn't be found in the versions list {version_index}")
+    return position
+
+
+def index_intervals(version_index, ranges_list):
+    """
+    `utils._index_intervals`.
+    """
+    cdef dict positions = version_index._positions
+    cdef list intervals = []
+    cdef Py_ssize_t last_index = len(version_index)
+    cdef Py_ssize_t lower_index, upper_index
+    cdef tuple lower, upper
+    for rng in ranges_list:
+        for rst in rng.constraints:
+            lower_bound, upper_bound = rst.bounds
+            # `Bound` tuples, index them as tuples
+            lower = <tuple>lower_bound
+            upper = <tuple>upper_bound
+            if lower == upper:
+                if not lower[0] and not upper[0]:
+                    # (,) [,] - all version included
+                    return None
+                # Exact version range - `[VER]`
+                lower_index = _position(positions, lower[0], version_index)
+                intervals.append((lower_index, lower_index + 1))
+                continue
+            if lower[0] is None:
+                lower_index = 0
+            else:
+                lower_index = _position(positions, lower[0], version_index)
+                if not lower[1]:
+                    lower_index += 1
+            if upper[0] is None:
+                if lower[0] is None:
+                    continue
+                upper_index = last_index
+            else:
+                upper_index = _position(positions, upper[0], version_index)
+                if upper[1]:
+                    upper_index += 1
+            intervals.append((lower_index, upper_index))
+    return intervals
+
+
+def merge_intervals(intervals):
+    """
+    `utils._merge_intervals`.
+    """
+    cdef list merged = []
+    cdef Py_ssize_t start, end, last_start = 0, last_end = -1
+    cdef bint empty = True
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if not empty and start <= last_end:
+            if end > last_end:
+                last_end = end
+        else:
+            if not empty:
+                merged.append((last_start, last_end))
+            last_start, last_end = start, end
+            empty = False
+    if not empty:
+        merged.append((last_start, last_end))
+    return merged
@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from unified_range import aio, api
+
+VERSIONS = [str(i) for i in range(20)]
+RANGES = ['[1,4)', '[3,6)', '(6,8)', '[10]', '(,0]', '[12,)']
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize('threshold', [aio.EXECUTOR_THRESHOLD, 1])
+def test_same_as_api(monkeypatch, threshold):
+    monkeypatch.setattr(aio, 'EXECUTOR_THRESHOLD', threshold)
+    monkeypatch.setattr(aio, 'YIELD_EVERY', 2)
+    with ThreadPoolExecutor(1) as executor:
+        assert _run(aio.filter_versions(VERSIONS, RANGES, executor)) == \
+            api.filter_versions(VERSIONS, RANGES)
+        assert _run(aio.next_filtered_version('5', VERSIONS, RANGES)) == \
+            api.next_filtered_version('5', VERSIONS, RANGES)
+        assert _run(aio.maximum_filtered_version(VERSIONS, RANGES)) == \
+            api.maximum_filtered_version(VERSIONS, RANGES)
+    with pytest.raises(ValueError):
+        _run(aio.next_filtered_version('99', VERSIONS, RANGES))
+
+
+def test_cooperative_yield_and_cancel(monkeypatch):
+    monkeypatch.setattr(aio, 'YIELD_EVERY', 1)
+    steps = []
+
+    async def _ticker():
+        while True:
+            steps.append(len(steps))
+            await asyncio.sleep(0)
+
+    async def _main():
+        ticker = asyncio.ensure_future(_ticker())
+        result = await aio.filter_versions(VERSIONS, RANGES)
+        assert len(steps) >= len(RANGES) - 1
+        task = asyncio.ensure_future(aio.filter_versions(VERSIONS, RANGES))
+        await asyncio.sleep(0)
+        task.cancel()
+        ticker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return result
+
+    assert _run(_main()) == api.filter_versions(VERSIONS, RANGES)
+
+
+def test_many_versions_dont_block_the_loop():
+    versions = [str(i) for i in range(49_000)]
+    ranges = [f'[{i},{i + 3})' for i in range(0, 1_600, 4)]
+    steps = []
+
+    async def _ticker():
+        while True:
+            steps.append(len(steps))
+            await asyncio.sleep(0)
+
+    async def _main():
+        ticker = asyncio.ensure_future(_ticker())
+        result = await aio.filter_versions(versions, ranges)
+        ticker.cancel()
+        return result
+
+    assert _run(_main()) == api.filter_versions(versions, ranges)
+    assert steps
@@ -65,3 +65,20 @@ def test_unified_full_way():
         results.append(str(unified))
 
     assert (results == expected_results)
+
+
+def test_batch_contains():
+    versions = {
+        'npm-pkg': ['2.0.0', '1.0.0', '1.5.0', '3.0.0', '2.5.0-rc.1'],
+        'maven-pkg': ['1.0-alpha', '1.0', '1.1'],
+        'no-ranges': ['1.0'],
+    }
+    ranges = {
+        'npm-pkg': ['<1.5.0', '>=2.0.0 <3.0.0'],
+        'maven-pkg': ['[1.0-alpha,1.0)'],
+    }
+    results = api.batch_contains(versions, ranges)
+    assert list(results['npm-pkg']) == [1, 1, 0, 0, 1]
+    assert list(results['no-ranges']) == [0]
+    maven_results = api.batch_contains(versions, ranges, ecosystem='maven')
+    assert list(maven_results['maven-pkg']) == [1, 0, 0]
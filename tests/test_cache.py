@@ -0,0 +1,53 @@
+import pytest
+
+from unified_range import api, cache
+from unified_range.cache import ParseCache
+from unified_range.models import UnifiedVersionRange
+
+
+def test_parse_cache_hits_and_evictions():
+    parse_cache = ParseCache(UnifiedVersionRange.create_from_spec, maxsize=2)
+    first = parse_cache('[1.0,2.0)')
+    assert parse_cache('[1.0,2.0)') is first
+    parse_cache('[3.0]')
+    parse_cache('(,1.0]')
+    info = parse_cache.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 3, 1)
+    assert info.currsize == 2
+    # least recently used entry was evicted
+    assert parse_cache('[1.0,2.0)') is not first
+
+    parse_cache.resize(0)
+    assert len(parse_cache) == 0
+    parse_cache.clear()
+    assert parse_cache.info() == (0, 0, 0, 0, 0)
+
+
+def test_parse_cache_does_not_cache_errors():
+    parse_cache = ParseCache(UnifiedVersionRange.create_from_spec)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            parse_cache('[1.0')
+    assert len(parse_cache) == 0
+
+
+def test_api_uses_caches():
+    cache.clear()
+    api.filter_versions(['1', '2', '3'], ['<2', '[3]'])
+    api.filter_versions(['1', '2', '3'], ['<2', '[3]'])
+    assert cache.range_cache.info()[:2] == (2, 2)
+    api.from_semver('<2')
+    api.unified_range('[3]')
+    api.unified_range('[3]')
+    assert cache.semver_cache.info()[:2] == (0, 1)
+    assert cache.unified_cache.info()[:2] == (1, 1)
+
+
+def test_cached_ranges_are_immutable():
+    rng = api.unified_range('[1.0,2.0)')
+    with pytest.raises(AttributeError):
+        rng.restrictions = ()
+    with pytest.raises(AttributeError):
+        rng.restrictions[0].lower_bound = None
+    with pytest.raises(AttributeError):
+        rng.restrictions[0].lower_bound.version = '0.1'
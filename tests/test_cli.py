@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from unified_range import cli
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_lines_keeps_order(workers):
+    ranges = ['>=1.0.0 <2.0.0', '[1,2)', '^1.2.3'] * 5
+    output, errors = io.StringIO(), io.StringIO()
+    failed = cli.run(ranges, output, errors, 'from-semver',
+                     workers=workers, chunk_size=2)
+    assert failed == 5
+    assert output.getvalue().splitlines() == \
+        ['[1.0.0,2.0.0)', '', '[1.2.3,2.0.0)'] * 5
+    assert errors.getvalue().splitlines()[0] == \
+        '2: Version ranges seems to already be maven version range'
+
+
+def test_run_jsonl():
+    lines = ['"[1.0,2.0)"', '{"range": ">1", "id": 3}', 'not json',
+             '{"range": "(,1.0]", "id": 4}']
+    output = io.StringIO()
+    failed = cli.run(lines, output, io.StringIO(), 'to-semver',
+                     fmt='jsonl', separator=' ', workers=1)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert failed == 2
+    assert rows[0] == {'range': '[1.0,2.0)', 'result': '>=1.0 <2.0'}
+    assert rows[1]['id'] == 3 and 'error' in rows[1]
+    assert rows[2]['line'] == 'not json' and 'error' in rows[2]
+    assert rows[3] == {'range': '(,1.0]', 'id': 4, 'result': '<=1.0'}
+
+
+@pytest.mark.parametrize('conversion', ['from-semver', 'to-semver'])
+def test_run_rejects_blank_lines(conversion):
+    output, errors = io.StringIO(), io.StringIO()
+    failed = cli.run(['', ' \t'], output, errors, conversion, workers=1)
+    assert failed == 2
+    assert output.getvalue() == '\n\n'
+    assert errors.getvalue().splitlines() == \
+        ['1: Empty range', '2: Empty range']
+
+
+def test_main(tmp_path):
+    input_path = tmp_path / 'ranges.txt'
+    output_path = tmp_path / 'unified.txt'
+    input_path.write_text('<1.0\n~1.2.3\n')
+    assert cli.main(['from-semver', '-i', str(input_path),
+                     '-o', str(output_path), '-j', '1']) == 0
+    assert output_path.read_text() == '(,1.0)\n[1.2.3,1.3.0)\n'
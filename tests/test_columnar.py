@@ -0,0 +1,45 @@
+import pytest
+
+from unified_range import api
+
+SEMVER_ROWS = ['^1.2.3', '>=1.0 <2.0', '^1.2.3', 'bad ^^', None, '1.2.x',
+               '>=1.0 <2.0']
+
+
+def test_from_semver_column():
+    column = api.from_semver_column(SEMVER_ROWS)
+    assert column.specs == [
+        None if rng is None or rng == 'bad ^^' else api.from_semver(rng)
+        for rng in SEMVER_ROWS]
+    assert column.errors == bytearray([0, 0, 0, 1, 0, 0, 0])
+    assert list(column.messages) == ['bad ^^']
+    assert api.from_semver_column([]) == ([], bytearray(), {})
+
+
+def test_to_semver_column():
+    rows = ['[1.0,2.0)', '(,1.0]', '[1.0,2.0)', '1.0']
+    column = api.to_semver_column(rows, separator=', ')
+    assert column.specs == ['>=1.0, <2.0', '<=1.0', '>=1.0, <2.0', None]
+    assert column.errors == bytearray([0, 0, 0, 1])
+    assert column.messages == {
+        '1.0': 'Recommended Version is currently not supported.'}
+
+
+def test_numpy_column():
+    numpy = pytest.importorskip('numpy')
+    rows = ['^1.2.3', '~1.0', '^1.2.3', 'zz<']
+    assert api.from_semver_column(numpy.array(rows)) == \
+        api.from_semver_column(rows)
+    column = api.from_semver_column(numpy.array([b'^1.2.3', b'\xff']))
+    assert column.specs == ['[1.2.3,2.0.0)', None]
+    assert column.errors == bytearray([0, 1])
+
+
+def test_arrow_column():
+    pa = pytest.importorskip('pyarrow')
+    rows = ['[1.0,2.0)', None, '(,1.0]', '[1.0,2.0)', 'bad']
+    chunked = pa.chunked_array([rows[:2], rows[2:]])
+    assert api.to_semver_column(chunked) == api.to_semver_column(rows)
+    assert api.to_semver_column(pa.array(rows)) == api.to_semver_column(rows)
+    assert api.to_semver_column(pa.chunked_array([], type=pa.string())) == \
+        ([], bytearray(), {})
@@ -0,0 +1,75 @@
+import pytest
+
+from unified_range.comparators import get_version_key, register_ecosystem
+
+
+def _assert_ascending(ecosystem, versions):
+    key = get_version_key(ecosystem)
+    for lower, upper in zip(versions, versions[1:]):
+        assert key(lower) < key(upper), (lower, upper)
+    assert sorted(reversed(versions), key=key) == versions
+
+
+def test_semver_order():
+    _assert_ascending('semver', [
+        '0.9.0', '1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-alpha.beta',
+        '1.0.0-beta', '1.0.0-beta.2', '1.0.0-beta.11', '1.0.0-rc.1', '1.0.0',
+        'v1.0.1', '2.0.20180219', '10.0.0'])
+    key = get_version_key('npm')
+    assert key('1.0') == key('1.0.0') == key('=1.0.0') == key('1.0.0+build')
+
+
+def test_maven_order():
+    _assert_ascending('maven', [
+        '1-alpha', '1-alpha-2', '1-beta', '1-milestone-1', '1-rc', '1-snapshot',
+        '1', '1-sp', '1-foo', '1-1', '1.0.1', '1.1', '2.0'])
+    key = get_version_key('maven')
+    assert key('1') == key('1.0.0') == key('1-ga') == key('1.0-final')
+    assert key('1-a1') == key('1-alpha-1') == key('1.0-ALPHA1')
+    assert key('1-cr1') == key('1-rc-1')
+
+
+def test_pep440_order():
+    _assert_ascending('pypi', [
+        '0.9', '1.0.dev0', '1.0a1.dev1', '1.0a1', '1.0b2', '1.0rc1', '1.0',
+        '1.0+local.1', '1.0.post1.dev0', '1.0.post1', '1.1', '1!0.1'])
+    key = get_version_key('pep440')
+    assert key('1.0') == key('1') == key('v1.0.0') != key('1.0-0')
+    assert key('1.0-0') == key('1.0.post0')
+    assert key('1.0a') == key('1.0.0alpha0')
+
+
+def test_rubygems_order():
+    _assert_ascending('rubygems', [
+        '0.9', '1.a.0.b', '1.a', '1.0-pre', '1.0.0.rc1', '1.0', '1.0.1',
+        '1.1.a', '1.1'])
+    key = get_version_key('rubygems')
+    assert key('1.0') == key('1') == key('1.0.0')
+    assert key('1.0.a') == key('1.a')
+
+
+def test_invalid_versions():
+    for ecosystem, version in [('semver', 'abc'), ('pypi', '1.0-foo'),
+                               ('rubygems', '1..0'), ('maven', ' ')]:
+        with pytest.raises(ValueError):
+            get_version_key(ecosystem)(version)
+    with pytest.raises(ValueError):
+        get_version_key('unknown')
+
+
+def test_custom_key():
+    key = get_version_key(len)
+    assert key is len
+    register_ecosystem('by-length', len)
+    assert get_version_key('BY-LENGTH') is len
+
+
+def test_composer_order():
+    _assert_ascending('composer', [
+        'dev-master', '1.0.0-dev', '1.0.0-alpha1', '1.0.0-beta',
+        '1.0.0-beta2-dev', '1.0.0-beta2', '1.0.0-RC1', '1.0.0', '1.0.0-p1',
+        '1.0.1', '1.0.x-dev', 'v2.0'])
+    key = get_version_key('packagist')
+    assert key('1.0') == key('1.0.0.0') == key('v1.0.0')
+    with pytest.raises(ValueError):
+        key('1.0.0.0.0')
@@ -0,0 +1,43 @@
+import pytest
+
+from unified_range import dialects, utils
+
+DIALECTS = [
+    ('>=1.2.3 <2.0.0 || ^3.0.0', dialects.NPM),
+    ('1.2.3 - 2.3.4', dialects.NPM),
+    ('~> 1.2', dialects.RUBY),
+    ('>= 1.0, < 2.0', dialects.RUBY),
+    ('>=1.0,<2.0 | ^3.0', dialects.COMPOSER),
+    ('[1.2.3,2.0.0),[3.0.0,)', dialects.MAVEN),
+    ('*', dialects.WILDCARD),
+    ('1.2.x', dialects.WILDCARD),
+    ('1.2.3', dialects.EXACT),
+    ('[1.0,2.0) >3', None),
+    ('1.0, 2.0', None),
+]
+
+
+@pytest.mark.parametrize('spec, dialect', DIALECTS)
+def test_detect(spec, dialect):
+    assert dialects.detect(spec) == dialect
+
+
+def test_classify():
+    assert dialects.classify('>= 1.0, < 2.0') == \
+        (dialects.RUBY, [[('>=', '1.0'), ('<', '2.0')]])
+    assert dialects.classify('1.2.3 - 2.3.4').tokens == \
+        [[('-', '1.2.3'), ('--', '2.3.4')]]
+    assert dialects.classify('[1.0,2.0),[3.0,)') == \
+        (dialects.MAVEN, [('[1.0,2.0)', True, '1.0,2.0', False),
+                          ('[3.0,)', True, '3.0,', False)])
+    with pytest.raises(ValueError, match='Not a valid semver'):
+        dialects.classify('[1.0,2.0) >3')
+
+
+def test_create_from_range():
+    assert str(utils.create_from_range('1.2.x')) == '[1.2.0,1.3.0)'
+    assert str(utils.create_from_range('1.2.3 - 2.3.4')) == '[1.2.3,2.3.4]'
+    assert str(utils.create_from_range('(,1.0]')) == '(,1.0]'
+    with pytest.raises(ValueError, match='Not a valid semver'):
+        # a maven soft requirement or an npm exact version
+        utils.create_from_range('1.2.3')
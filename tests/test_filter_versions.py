@@ -1,8 +1,10 @@
+import pytest
 from hypothesis import given, example, note, assume, settings, HealthCheck
 from hypothesis.strategies import (sampled_from, integers, booleans,
                                    composite, data)
 
-from unified_range import api
+from unified_range import api, utils
+from unified_range.models import VersionIndex
 
 N = 20
 # range was 0-19 but versions in ranges could be 20 which lead to value error
@@ -194,3 +196,143 @@ def test_maximum_filtered_version(data):
         assert not filtered_versions
     else:
         assert result == filtered_versions[-1]
+
+
+def test_overlapping_and_adjacent_ranges():
+    ranges = ['[1,4)', '[3,6)', '(6,8)', '[10]', '(,0]', '[12,)']
+    result = api.filter_versions(VERSIONS, ranges)
+    assert result == ['6', '8', '9', '11']
+
+
+@given(data=data(),
+       current_version=versions())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_version_index_same_as_list(data, current_version):
+    n_ranges = data.draw(integers(min_value=0, max_value=N + 1))
+    rng_tuples = [data.draw(range_tuples()) for _ in range(n_ranges)]
+    ranges = [range_tuple_to_str(rng) for rng in rng_tuples]
+    note(ranges)
+    version_index = VersionIndex(VERSIONS)
+    assert (api.filter_versions(version_index, ranges) ==
+            api.filter_versions(VERSIONS, ranges))
+    assert (api.next_filtered_version(str(current_version), version_index,
+                                      ranges) ==
+            api.next_filtered_version(str(current_version), VERSIONS, ranges))
+    assert (api.maximum_filtered_version(version_index, ranges) ==
+            api.maximum_filtered_version(VERSIONS, ranges))
+
+
+@given(data=data())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_contains_same_as_filter_versions(data):
+    n_ranges = data.draw(integers(min_value=0, max_value=N + 1))
+    rng_tuples = [data.draw(range_tuples()) for _ in range(n_ranges)]
+    ranges = [range_tuple_to_str(rng) for rng in rng_tuples]
+    note(ranges)
+    parsed = [api.unified_range(rng) for rng in ranges]
+    not_included = [v for v in VERSIONS
+                    if not any(rng.contains(v) for rng in parsed)]
+    assert not_included == api.filter_versions(VERSIONS, ranges)
+
+
+@given(data=data())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_batch_contains_same_as_filter_versions(data):
+    n_ranges = data.draw(integers(min_value=0, max_value=N + 1))
+    rng_tuples = [data.draw(range_tuples()) for _ in range(n_ranges)]
+    ranges = [range_tuple_to_str(rng) for rng in rng_tuples]
+    note(ranges)
+    mask = api.batch_contains({'pkg': VERSIONS}, {'pkg': ranges})['pkg']
+    not_included = [v for v, included in zip(VERSIONS, mask) if not included]
+    assert not_included == api.filter_versions(VERSIONS, ranges)
+
+
+@pytest.mark.skipif(utils.numpy is None, reason='numpy is not installed')
+@given(data=data())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_numpy_backend_same_as_python(data):
+    n_ranges = data.draw(integers(min_value=0, max_value=N + 1))
+    rng_tuples = [data.draw(range_tuples()) for _ in range(n_ranges)]
+    ranges = [api.unified_range(range_tuple_to_str(rng))
+              for rng in rng_tuples]
+    note(ranges)
+    python_result = utils.not_included_versions(VERSIONS, ranges,
+                                                backend='python')
+    assert utils.not_included_versions(VERSIONS, ranges,
+                                       backend='numpy') == python_result
+    python_mask = utils.not_included_mask(VERSIONS, ranges, backend='python')
+    numpy_mask = utils.not_included_mask(VERSIONS, ranges, backend='numpy')
+    assert numpy_mask.tolist() == python_mask
+    assert [v for v, m in zip(VERSIONS, python_mask) if m] == python_result
+
+
+@given(data=data())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_set_algebra_same_as_filter_versions(data):
+    left, right = [
+        [range_tuple_to_str(data.draw(range_tuples()))
+         for _ in range(data.draw(integers(min_value=1, max_value=5)))]
+        for _ in range(2)]
+    note((left, right))
+    left_rng = api.unified_range(','.join(left))
+    right_rng = api.unified_range(','.join(right))
+    left_out = set(api.filter_versions(VERSIONS, left))
+    right_out = set(api.filter_versions(VERSIONS, right))
+
+    def _included(rng):
+        return {v for v in VERSIONS if rng.contains(v)}
+
+    assert _included(left_rng.normalize()) == set(VERSIONS) - left_out
+    assert _included(left_rng.union(right_rng)) == \
+        set(VERSIONS) - (left_out & right_out)
+    assert _included(left_rng.intersection(right_rng)) == \
+        set(VERSIONS) - (left_out | right_out)
+    assert _included(left_rng.complement()) == left_out
+    assert _included(left_rng.difference(right_rng)) == \
+        right_out - left_out
+
+
+@given(data=data())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_iter_filter_versions_same_as_filter_versions(data):
+    n_ranges = data.draw(integers(min_value=0, max_value=N + 1))
+    rng_tuples = [data.draw(range_tuples()) for _ in range(n_ranges)]
+    ranges = [range_tuple_to_str(rng) for rng in rng_tuples]
+    note(ranges)
+    assert list(api.iter_filter_versions(iter(VERSIONS), ranges)) == \
+        api.filter_versions(VERSIONS, ranges)
+
+
+def test_iter_filter_versions_is_lazy():
+    def _versions():
+        yield from ['1', '2', '3']
+        assert False, 'versions were consumed after the last yield'
+
+    filtered = api.iter_filter_versions(_versions(), ['[2]', '>=3'])
+    assert next(filtered) == '1'
+    with pytest.raises(ValueError) as error:
+        list(api.iter_filter_versions(iter(['1', '2']), ['[1,3)']))
+    assert str(error.value) == \
+        "Version 3 couldn't be found in the versions list"
+
+
+@given(data=data(),
+       current_version=versions())
+@settings(suppress_health_check=(HealthCheck.filter_too_much,))
+def test_next_filtered_version_is_first_filtered(data, current_version):
+    n_ranges = data.draw(integers(min_value=0, max_value=N + 1))
+    rng_tuples = [data.draw(range_tuples()) for _ in range(n_ranges)]
+    ranges = [range_tuple_to_str(rng) for rng in rng_tuples]
+    note(ranges)
+    result = api.next_filtered_version(str(current_version), VERSIONS, ranges)
+    expected = [v for v in api.filter_versions(VERSIONS, ranges)
+                if int(v) >= current_version]
+    assert result == (expected[0] if expected else None)
+
+
+def test_next_filtered_version_repeated_versions():
+    versions = ['1', '2', '3', '1', '4']
+    assert api.next_filtered_version('2', versions, ['[2,3]']) == '4'
+    assert api.next_filtered_version('3', versions, ['[3,4]']) is None
+    assert api.maximum_filtered_version(versions, ['[4]']) == '1'
+    assert api.maximum_filtered_version(versions, ['[1,4]']) is None
@@ -0,0 +1,76 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from unified_range import api
+from unified_range.incremental import IncrementalFilter
+
+VERSIONS = ['0.1.0', '0.2.0', '1.0.0', '1.1.0', '2.0.0']
+
+
+def test_incremental_filter():
+    evaluator = IncrementalFilter(VERSIONS, ['[,0.2.0]', '[1.1.0]'])
+    assert evaluator.not_included() == ['1.0.0', '2.0.0']
+    evaluator.add_version('1.0.5')
+    evaluator.add_version('3.0.0')
+    assert evaluator.versions == ['0.1.0', '0.2.0', '1.0.0', '1.0.5',
+                                  '1.1.0', '2.0.0', '3.0.0']
+    evaluator.add_range('>=1.0.0 <2.0.0')
+    assert evaluator.not_included() == ['2.0.0', '3.0.0']
+    assert evaluator.next_safe('0.1.0') == '2.0.0'
+    assert evaluator.max_safe() == '3.0.0'
+    assert evaluator.matches('1.0.5')
+    evaluator.add_version('1.5.0')
+    assert evaluator.matches('1.5.0')
+    evaluator.remove_range('[1.1.0]')
+    evaluator.remove_range('>=1.0.0 <2.0.0')
+    assert evaluator.not_included() == ['1.0.0', '1.0.5', '1.1.0', '1.5.0',
+                                        '2.0.0', '3.0.0']
+    assert evaluator.ranges == ['[,0.2.0]']
+
+
+def test_incremental_filter_errors():
+    with pytest.raises(ValueError, match='ascending'):
+        IncrementalFilter(['1.0.0', '0.1.0'])
+    evaluator = IncrementalFilter(VERSIONS, ecosystem='npm')
+    with pytest.raises(ValueError):
+        evaluator.add_version('1.0')
+    with pytest.raises(ValueError, match="couldn't be found"):
+        evaluator.add_range('[1.0,2.0.0)')
+    with pytest.raises(ValueError):
+        evaluator.remove_range('[1.0.0]')
+    with pytest.raises(ValueError):
+        evaluator.next_safe('0.3.0')
+
+
+@given(st.lists(st.integers(0, 19), min_size=1, unique=True),
+       st.lists(st.tuples(st.integers(0, 19), st.integers(0, 19),
+                          st.booleans()), max_size=6),
+       st.data())
+def test_incremental_filter_like_filter_versions(order, bounds, data):
+    all_versions = [f'{i}.0.0' for i in range(20)]
+    initial = sorted(order[:len(order) // 2 + 1])
+    evaluator = IncrementalFilter([all_versions[i] for i in initial])
+    ranges = []
+    for i in order[len(order) // 2 + 1:]:
+        evaluator.add_version(all_versions[i])
+    present = sorted(order)
+    for lower, upper, add in bounds:
+        lower, upper = sorted((present[lower % len(present)],
+                               present[upper % len(present)]))
+        if add or not ranges:
+            rng = f'[{all_versions[lower]},{all_versions[upper]})' \
+                if lower != upper else f'[{all_versions[lower]}]'
+            evaluator.add_range(rng)
+            ranges.append(rng)
+        else:
+            rng = data.draw(st.sampled_from(ranges))
+            ranges.remove(rng)
+            evaluator.remove_range(rng)
+    versions = [all_versions[i] for i in present]
+    assert evaluator.not_included() == api.filter_versions(versions, ranges)
+    assert evaluator.max_safe() == \
+        api.maximum_filtered_version(versions, ranges)
+    for version in versions:
+        assert evaluator.next_safe(version) == \
+            api.next_filtered_version(version, versions, ranges)
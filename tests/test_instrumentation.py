@@ -0,0 +1,63 @@
+import pytest
+
+from unified_range import api, cache, instrumentation
+
+VERSIONS = ['0.1', '0.2', '1.0', '1.1', '2.0']
+RANGES = ['[,0.2]', '[1.1]', '<1.0']
+
+
+def test_disabled_by_default():
+    assert instrumentation.sink is None
+    assert instrumentation.start('filter_versions') is None
+
+
+def test_aggregator_records_stages():
+    cache.clear()
+    aggregator = instrumentation.Aggregator()
+    with instrumentation.recording(aggregator):
+        api.filter_versions(VERSIONS, RANGES)
+        api.filter_versions(VERSIONS, RANGES)
+    assert instrumentation.sink is None
+    snapshot = aggregator.snapshot()
+    for stage in ('parse', 'filter', 'total'):
+        assert snapshot['timing', 'filter_versions', stage].count == 2
+    for stage in ('index', 'lookup', 'intervals', 'output'):
+        assert snapshot['timing', 'not_included_versions', stage].count == 2
+    assert snapshot['size', 'filter_versions', 'versions'].total == 10
+    assert snapshot['size', 'filter_versions', 'ranges'].max == 3
+    assert snapshot['count', 'range_cache', 'misses'].total == 3
+    assert snapshot['count', 'range_cache', 'hits'].total == 3
+    assert snapshot['size', 'create_from_range', 'restrictions'].count == 3
+
+    text = aggregator.to_prometheus()
+    assert '# TYPE unified_range_stage_seconds summary' in text
+    assert 'unified_range_stage_seconds_count{operation="filter_versions",' \
+           'stage="parse"} 2' in text
+    assert 'unified_range_events_total{operation="range_cache",' \
+           'event="hits"} 3' in text
+    aggregator.reset()
+    assert aggregator.snapshot() == {}
+
+
+def test_prometheus_precision():
+    aggregator = instrumentation.Aggregator()
+    aggregator(instrumentation.Event('count', 'unified_cache', 'hits',
+                                     3000001))
+    aggregator(instrumentation.Event('timing', 'filter_versions', 'total',
+                                     1234.5678901))
+    text = aggregator.to_prometheus()
+    assert 'event="hits"} 3000001\n' in text
+    assert 'stage="total"} 1234.5678901\n' in text
+
+
+def test_callback_sink():
+    events = []
+    with instrumentation.recording(events.append):
+        api.maximum_filtered_version(VERSIONS, RANGES)
+    assert instrumentation.Event(
+        'size', 'maximum_filtered_version', 'ranges', 3) in events
+    assert {event.name for event in events
+            if event.operation == 'maximum_filtered_version'} == \
+        {'parse', 'search', 'total', 'versions', 'ranges'}
+    with pytest.raises(ValueError):
+        instrumentation.enable('not callable')
@@ -0,0 +1,32 @@
+import pytest
+
+from unified_range import api
+
+VERSIONS = ['2.0.0', '1.0.0', '1.5.0', '3.0.0', '2.5.0-rc.1', '0.9.0']
+
+
+def test_range_matcher():
+    matcher = api.compile(['<1.5.0', '>=2.0.0 <3.0.0', '[0.5.0]'], VERSIONS)
+    assert matcher.matches('1.0.0')
+    assert matcher.matches('2.5.0-rc.1')
+    assert not matcher.matches('1.7.0')
+    assert matcher.filter(VERSIONS) == ['1.5.0', '3.0.0']
+    assert matcher.next_safe('0.1.0') == '1.5.0'
+    assert matcher.next_safe('1.6.0') == '3.0.0'
+    assert matcher.next_safe('3.0.1') is None
+    assert matcher.max_safe() == '3.0.0'
+    assert matcher.max_safe(['1.0.0', '2.0.0']) is None
+
+
+def test_range_matcher_ecosystem():
+    matcher = api.compile(['[1.0-alpha,1.0)'], ecosystem='maven')
+    versions = ['1.0-alpha', '1.0-beta', '1.0', '1.0-sp']
+    assert matcher.filter(versions) == ['1.0', '1.0-sp']
+    assert matcher.next_safe('1.0-alpha', versions) == '1.0'
+    assert matcher.max_safe(versions) == '1.0-sp'
+
+
+def test_range_matcher_requires_versions():
+    matcher = api.compile(['<1.5.0'])
+    with pytest.raises(ValueError):
+        matcher.max_safe()
@@ -0,0 +1,182 @@
+import pickle
+import tracemalloc
+
+import pytest
+
+from unified_range.models import (Bound, Restriction, UnifiedVersionRange,
+                                  Version)
+
+
+def test_models_are_hashable():
+    specs = ['[1.0,2.0)', '[1.0,2.0)', '(,1.0]', '[1.2.3]', '(,1.0]']
+    ranges = {UnifiedVersionRange.create_from_spec(s) for s in specs}
+    assert sorted(map(str, ranges)) == ['(,1.0]', '[1.0,2.0)', '[1.2.3]']
+    assert len({Version('1.0'), Version('1.0'), Version(None)}) == 2
+    assert hash(Restriction.all_versions()) == hash(
+        UnifiedVersionRange.create_from_spec('(,)').restrictions[0])
+
+
+def test_models_use_slots():
+    rng = UnifiedVersionRange.create_from_spec('[1.0,2.0)')
+    for obj in (rng, rng.restrictions[0], rng.restrictions[0].lower_bound):
+        assert not hasattr(obj, '__dict__')
+        with pytest.raises(AttributeError):
+            obj.new_attribute = 1
+
+
+def test_bounds_are_stored_once():
+    rst = UnifiedVersionRange.create_from_spec('(1.0,2.0]').restrictions[0]
+    assert rst.bounds[0] is rst.bounds[0] and rst.bounds[1] is rst.bounds[1]
+    assert rst.bounds == (Bound('1.0', False), Bound('2.0', True))
+    assert rst.lower_bound == Version('1.0') and not rst.has_inclusive_lower
+    assert rst.upper_bound == Version('2.0') and rst.has_inclusive_upper
+
+
+class _DictVersion:
+    def __init__(self, version):
+        self.version = version
+
+
+class _DictRestriction:
+    # the models before `__slots__` - the bound Versions and the flags in
+    # the instance dict
+    def __init__(self, lower_bound, has_inclusive_lower, upper_bound,
+                 has_inclusive_upper):
+        self.lower_bound = lower_bound
+        self.has_inclusive_lower = has_inclusive_lower
+        self.upper_bound = upper_bound
+        self.has_inclusive_upper = has_inclusive_upper
+
+
+class _DictRange:
+    def __init__(self, recommended_version, restrictions):
+        self.recommended_version = recommended_version
+        self.restrictions = restrictions
+
+
+def _traced_size(build, items) -> int:
+    tracemalloc.start()
+    try:
+        built = [build(item) for item in items]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(built) == len(items)
+    return size
+
+
+def test_memory_footprint():
+    specs = [f"[{i}.0,{i}.5),[{i}.7,{i}.8],({i + 1}.1,)" for i in range(2000)]
+    # the same (shared) version strings for both layouts
+    bounds = [[rst.bounds for rst in
+               UnifiedVersionRange.create_from_spec(spec).restrictions]
+              for spec in specs]
+    slotted = _traced_size(lambda rng: UnifiedVersionRange(None, [
+        Restriction(Version(lower.version), lower.inclusive,
+                    Version(upper.version), upper.inclusive)
+        for lower, upper in rng]), bounds)
+    dict_based = _traced_size(lambda rng: _DictRange(None, [
+        _DictRestriction(_DictVersion(lower.version), lower.inclusive,
+                         _DictVersion(upper.version), upper.inclusive)
+        for lower, upper in rng]), bounds)
+    # about 2/3 on python 3.11, whose instance dicts are the most compact
+    assert slotted < 0.8 * dict_based
+
+
+def test_models_pickle():
+    rng = UnifiedVersionRange.create_from_spec('(,1.0),[1.5,2.0]')
+    assert pickle.loads(pickle.dumps(rng)) == rng
+    assert str(pickle.loads(pickle.dumps(rng))) == '(,1.0),[1.5,2.0]'
+
+
+@pytest.mark.parametrize('spec, included, excluded', [
+    ('(,)', ['0', '1.0', '99'], []),
+    ('[1.2.3]', ['1.2.3'], ['1.2.2', '1.2.4']),
+    ('(,1.0),[1.5,2.0],[3.0]', ['0.9', '1.5', '2.0', '3.0', '3'],
+     ['1.0', '1.2', '2.0.1', '3.0.1']),
+    ('(1.0,)', ['1.0.1', '2.0'], ['1.0', '0.1', '1.0.0-rc.1']),
+])
+def test_contains(spec, included, excluded):
+    rng = UnifiedVersionRange.create_from_spec(spec)
+    for version in included:
+        assert rng.contains(version), version
+    for version in excluded:
+        assert not rng.contains(version), version
+
+
+def test_contains_ecosystem():
+    rng = UnifiedVersionRange.create_from_spec('[1.0-alpha,1.0)')
+    assert rng.contains('1.0-beta', ecosystem='maven')
+    assert not rng.contains('1.0-sp', ecosystem='maven')
+    assert rng.restrictions[0].contains('1.0-rc-1', 'maven')
+
+
+def test_create_from_spec_many_restrictions():
+    spec = ', '.join(f'[{i}.0,{i}.5)' for i in range(500))
+    rng = UnifiedVersionRange.create_from_spec(f' {spec} ')
+    assert len(rng.restrictions) == 500
+    assert str(rng) == spec.replace(' ', '')
+
+
+@pytest.mark.parametrize('spec, message', [
+    ('[1.0,2.0),[3.0', 'Unbounded range: [1.0,2.0),[3.0 (at position 10)'),
+    ('  [1.0,2.0) 3.0]',
+     'Only fully-qualified sets allowed in multiple set scenario: '
+     '  [1.0,2.0) 3.0] (at position 12)'),
+    ('(1.0)', 'Single version must be surrounded by []: (1.0)'),
+    ('[1.0,1.0]', 'Range cannot have identical boundaries: [1.0,1.0]'),
+    ('1.0', 'Recommended Version is currently not supported.'),
+    (5, "Only Strings allowed.\ninput spec:5\ntype: <class 'int'>"),
+])
+def test_create_from_spec_errors(spec, message):
+    with pytest.raises(ValueError) as error:
+        UnifiedVersionRange.create_from_spec(spec)
+    assert str(error.value) == message
+
+
+@pytest.mark.parametrize('spec, normalized', [
+    ('[1.0,2.0),[1.5,3.0),[3.0]', '[1.0,3.0]'),
+    ('[2.0,3.0),(,1.0)', '(,1.0),[2.0,3.0)'),
+    ('[1.0,2.0),[2.0,3.0)', '[1.0,3.0)'),
+    ('(1.0,2.0),(2.0,3.0)', '(1.0,2.0),(2.0,3.0)'),
+    ('(,1.0],[0.5,)', '(,)'),
+    ('[3.0],[3.0.0]', '[3.0]'),
+    ('(,)', '(,)'),
+])
+def test_normalize(spec, normalized):
+    rng = UnifiedVersionRange.create_from_spec(spec)
+    assert str(rng.normalize()) == normalized
+    assert rng.normalize().normalize() == rng.normalize()
+    versions = ['0.1', '1.0', '1.2', '1.5', '2.0', '2.5', '3.0', '3.1']
+    for version in versions:
+        assert rng.contains(version) == rng.normalize().contains(version)
+
+
+def test_normalize_empty():
+    empty = UnifiedVersionRange.create_from_spec('[2.0,3.0)').intersection(
+        UnifiedVersionRange.create_from_spec('[1.0,2.0)'))
+    assert empty.restrictions == ()
+    # no range string, stored with the binary encoding instead
+    assert str(empty) == ''
+    assert UnifiedVersionRange.create_from_spec(str(empty)) is None
+    assert UnifiedVersionRange.from_bytes(empty.to_bytes()) == empty
+
+
+def test_normalize_ecosystem():
+    rng = UnifiedVersionRange.create_from_spec('[1.0-alpha,1.0-rc),[1.0-rc,1.0)')
+    assert str(rng.normalize('maven')) == '[1.0-alpha,1.0)'
+
+
+def test_set_algebra():
+    first = UnifiedVersionRange.create_from_spec('[1.0,2.0),[3.0,4.0]')
+    second = UnifiedVersionRange.create_from_spec('[1.5,3.0]')
+    assert str(first.union(second)) == '[1.0,4.0]'
+    assert str(first.intersection(second)) == '[1.5,2.0),[3.0]'
+    assert str(first.complement()) == '(,1.0),[2.0,3.0),(4.0,)'
+    assert str(first.difference(second)) == '[1.0,1.5),(3.0,4.0]'
+    assert str(second.difference(first)) == '[2.0,3.0)'
+    assert str(first.complement().complement()) == str(first)
+    all_versions = UnifiedVersionRange.create_from_spec('(,)')
+    assert all_versions.complement().restrictions == ()
+    assert all_versions.complement().complement() == all_versions
+    assert str(first.union(second, all_versions.complement())) == '[1.0,4.0]'
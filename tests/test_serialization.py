@@ -0,0 +1,78 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from unified_range import serialization
+from unified_range.models import Restriction, UnifiedVersionRange, Version
+
+SPECS = ['[1.0,2.0)', '(,1.0],[1.2,)', '[1.0]', '(,)', '(1.0,2.0]',
+         '[0.1,0.2),[0.3],[1.0-rc.1,1.0.1)']
+
+
+def _assert_same(decoded, rng):
+    assert decoded == rng
+    assert str(decoded) == str(rng)
+    assert decoded.recommended_version == rng.recommended_version
+    for rst, expected in zip(decoded.restrictions, rng.restrictions):
+        assert rst.bounds == expected.bounds
+        assert rst.lower_bound == expected.lower_bound
+        assert rst.upper_bound == expected.upper_bound
+
+
+@pytest.mark.parametrize('spec', SPECS)
+def test_round_trip(spec):
+    rng = UnifiedVersionRange.create_from_spec(spec)
+    _assert_same(UnifiedVersionRange.from_bytes(rng.to_bytes()), rng)
+
+
+def test_round_trip_list():
+    ranges = [UnifiedVersionRange.create_from_spec(spec) for spec in SPECS]
+    ranges.append(UnifiedVersionRange.create_from_version('1.2.3'))
+    ranges.append(UnifiedVersionRange(None, []))
+    decoded = serialization.loads(memoryview(serialization.dumps(ranges)))
+    assert len(decoded) == len(ranges)
+    for dec, rng in zip(decoded, ranges):
+        _assert_same(dec, rng)
+    assert str(decoded[-2]) == '1.2.3'
+    assert serialization.loads(serialization.dumps([])) == []
+
+
+def test_shared_strings_and_restrictions():
+    ranges = [UnifiedVersionRange.create_from_spec('[1.0,2.0)')] * 3
+    data = serialization.dumps(ranges)
+    assert data.count(b'1.0') == 1
+    decoded = serialization.loads(data)
+    assert decoded[0].restrictions[0] is decoded[2].restrictions[0]
+
+
+@given(st.lists(st.lists(
+    st.tuples(st.booleans(), st.sampled_from(['', '1.0', '1.2', '2.0']),
+              st.sampled_from(['', '1.0', '1.5', '3.0']), st.booleans()),
+    min_size=1, max_size=4), max_size=5))
+def test_round_trip_generated(specs):
+    ranges = [UnifiedVersionRange(None, [
+        Restriction(Version(lower or None), lower_inclusive,
+                    Version(upper or None), upper_inclusive)
+        for lower_inclusive, lower, upper, upper_inclusive in restrictions])
+        for restrictions in specs]
+    for dec, rng in zip(serialization.loads(serialization.dumps(ranges)),
+                        ranges):
+        _assert_same(dec, rng)
+
+
+def test_invalid_data():
+    data = UnifiedVersionRange.create_from_spec('[1.0,2.0)').to_bytes()
+    with pytest.raises(ValueError, match='Not an encoded'):
+        serialization.loads(b'XX' + data[2:])
+    with pytest.raises(ValueError, match='Unsupported'):
+        serialization.loads(data[:2] + b'\x09' + data[3:])
+    with pytest.raises(ValueError, match='Truncated'):
+        serialization.loads(data[:-1])
+    with pytest.raises(ValueError, match='single'):
+        serialization.from_bytes(serialization.dumps([]))
+
+
+def test_nul_in_version():
+    rng = UnifiedVersionRange.create_from_version('1.0\0')
+    with pytest.raises(ValueError):
+        rng.to_bytes()
@@ -0,0 +1,88 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from unified_range import speedups, utils  # noqa: F401 - registers kernels
+from unified_range.models import (Restriction, UnifiedVersionRange, Version,
+                                  VersionIndex)
+
+compiled = pytest.mark.skipif(not speedups.ENABLED,
+                              reason="compiled kernels aren't installed")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(kernel, *args):
+    """
+    Return the result of a kernel, or the error it raised (and the tokens
+    a lexer yielded before it).
+    """
+    tokens = []
+    try:
+        result = kernel(*args)
+        if result is None or isinstance(result, list):
+            return result
+        for token in result:
+            tokens.append(token)
+        return tokens
+    except ValueError as e:
+        return tokens, str(e)
+
+
+def _same(name, *args):
+    return _run(speedups.PURE_KERNELS[name], *args) == \
+        _run(getattr(speedups._speedups, name), *args)
+
+
+@compiled
+@given(st.text(alphabet=" <>=^~|,-.0123vVx*\t　a", max_size=16))
+def test_lex_semver(semver):
+    assert _same("lex_semver", semver)
+
+
+@compiled
+@given(st.text(alphabet="[](), 1.2-a\t　", max_size=16))
+def test_lex_unified(spec):
+    assert _same("lex_unified", spec)
+
+
+@compiled
+@given(st.lists(st.lists(st.tuples(
+    st.sampled_from([None, "", "1", "2", "3", "9"]), st.booleans(),
+    st.sampled_from([None, "", "1", "2", "3", "9"]), st.booleans()),
+    max_size=3), max_size=3),
+    st.lists(st.tuples(st.integers(0, 5), st.integers(0, 5)), max_size=5))
+def test_filter_kernels(ranges, intervals):
+    versions = ["1", "2", "1", "3"]
+    ranges = [UnifiedVersionRange(None, [
+        Restriction(Version(lower), has_lower, Version(upper), has_upper)
+        for lower, has_lower, upper, has_upper in restrictions])
+        for restrictions in ranges]
+    assert _same("version_positions", versions)
+    assert _same("index_intervals", VersionIndex(versions), ranges)
+    assert _same("merge_intervals", intervals)
+
+
+def test_pure_python_switch():
+    env = dict(os.environ, UNIFIED_RANGE_PURE_PYTHON="1")
+    enabled = subprocess.run(
+        [sys.executable, "-c",
+         "from unified_range import speedups; print(speedups.ENABLED)"],
+        env=env, stdout=subprocess.PIPE, universal_newlines=True,
+        check=True).stdout
+    assert enabled.strip() == "False"
+
+
+def test_released_with_the_package():
+    with open(os.path.join(ROOT, "pyproject.toml")) as f:
+        pyproject = f.read()
+    # a build script would make the package wheel platform specific
+    assert not re.search(r"^build\s*=", pyproject, re.M)
+    version = re.search(r'^version = "(.*)"', pyproject, re.M).group(1)
+    with open(os.path.join(ROOT, "speedups", "setup.py")) as f:
+        assert f'VERSION = "{version}"' in f.read()
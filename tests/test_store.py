@@ -0,0 +1,73 @@
+import os
+import stat
+
+import pytest
+
+from unified_range import api, store
+
+VERSIONS = ['0.1', '0.2', '1.0', '1.1', '1.2', '2.0']
+RANGES = {
+    'npm:a': ['<1.0', '[1.2]'],
+    'maven:b': ['[0.2,1.1)', '>=2.0'],
+    'pypi:é': ['(,)'],
+    'gem:empty': [],
+}
+
+
+@pytest.fixture
+def range_store(tmp_path):
+    path = str(tmp_path / 'ranges.urdb')
+    store.build(path, RANGES)
+    with store.RangeStore(path, cache_size=2) as opened:
+        yield opened
+
+
+def test_store_packages(range_store):
+    assert len(range_store) == 4
+    assert list(range_store) == sorted(RANGES, key=str.encode)
+    assert 'npm:a' in range_store
+    assert 'npm:missing' not in range_store
+    assert range_store.ranges('maven:b') == [
+        api.unified_range('[0.2,1.1)'), api.unified_range('[2.0,)')]
+    assert range_store.ranges('gem:empty') == []
+    assert range_store.ranges('npm:missing') == []
+
+
+@pytest.mark.parametrize('package', list(RANGES) + ['npm:missing'])
+def test_store_queries(range_store, package):
+    ranges = RANGES.get(package, [])
+    assert range_store.filter_versions(package, VERSIONS) == \
+        api.filter_versions(VERSIONS, ranges)
+    assert range_store.maximum_filtered_version(package, VERSIONS) == \
+        api.maximum_filtered_version(VERSIONS, ranges)
+    for version in VERSIONS:
+        assert range_store.next_filtered_version(
+            package, version, VERSIONS) == \
+            api.next_filtered_version(version, VERSIONS, ranges)
+
+
+def test_store_invalid(tmp_path):
+    path = tmp_path / 'ranges.urdb'
+    path.write_bytes(b'not a store file at all, not at all')
+    with pytest.raises(ValueError, match='Not a unified range store'):
+        store.RangeStore(str(path))
+    with pytest.raises(ValueError):
+        store.build(str(path), {'npm:a': ['not a range']})
+    # the temporary file is removed
+    assert [child.name for child in tmp_path.iterdir()] == ['ranges.urdb']
+    with pytest.raises(FileNotFoundError):
+        store.build(str(tmp_path / 'missing' / 'ranges.urdb'), RANGES)
+    store.build(str(path), RANGES)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match='Truncated'):
+        store.RangeStore(str(path))
+
+
+def test_store_file_mode(tmp_path):
+    path = tmp_path / 'ranges.urdb'
+    umask = os.umask(0o022)
+    try:
+        store.build(str(path), RANGES)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o644
@@ -0,0 +1,45 @@
+import pytest
+
+from unified_range import api
+from unified_range.universe import build_universe
+
+
+def test_version_universe():
+    versions = ['2.0.0', '1.0.0', '0.9.0', '1.0.0-rc.1', '1.0.0', '1.1.0']
+    universe = api.version_universe(versions, 'npm', ['>=1.0.0 <2.0.0'])
+    assert list(universe) == ['0.9.0', '1.0.0-rc.1', '1.0.0', '1.1.0',
+                              '2.0.0']
+    assert api.version_universe(list(reversed(versions)), 'npm') is universe
+    ranges = ['>=1.0.0 <2.0.0']
+    assert api.filter_versions(universe, ranges) == \
+        ['0.9.0', '1.0.0-rc.1', '2.0.0']
+    assert api.next_filtered_version('1.0.0', universe, ranges) == '2.0.0'
+    assert api.maximum_filtered_version(universe, ranges) == '2.0.0'
+
+
+@pytest.mark.parametrize('ecosystem, expected', [
+    # pre-releases before the release, numeric identifiers compared as numbers
+    ('semver', ['0.9.0', '1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-beta.2',
+                '1.0.0-beta.11', '1.0.0-rc.1', '1.0.0', '1.0.1']),
+    ('maven', ['0.9', '1.0-alpha-1', '1.0-beta', '1.0-milestone-1',
+               '1.0-rc1', '1.0-SNAPSHOT', '1.0', '1.0-sp']),
+    ('pypi', ['0.9', '1.0.dev0', '1.0a1', '1.0b2', '1.0rc1', '1.0',
+              '1.0.post1']),
+    ('rubygems', ['0.9', '1.0.a', '1.0.b1', '1.0', '1.0.1']),
+    ('composer', ['dev-main', '0.9', '1.0.0-alpha2', '1.0.0-beta',
+                  '1.0.0-RC1', '1.0.0']),
+])
+def test_universe_ecosystem_order(ecosystem, expected):
+    versions = expected[1::2][::-1] + expected[::2]
+    assert list(build_universe(versions, ecosystem)) == expected
+
+
+def test_universe_equal_keys_and_validation():
+    universe = build_universe(['1.0.0', '1.0', '1'], 'semver')
+    assert list(universe) == ['1', '1.0', '1.0.0']
+    assert universe.missing_bounds([api.unified_range('[1.0,2.0)')]) == \
+        ['2.0']
+    with pytest.raises(ValueError, match=r"\['2.0.0'\]"):
+        api.version_universe(['1.0.0'], ranges=['^1.0.0'])
+    with pytest.raises(ValueError):
+        build_universe(['not a version'])
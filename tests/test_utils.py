@@ -34,73 +34,6 @@ expected_comma_separated_semver_range = [
     '<2.11.2 || >=3.0.0, <3.6.4 || >=4.0.0, <4.5.7 || >=5.0.0, <5.2.1'
 ]
 
-before_clean = [
-    # npm
-    "=3.0.0-rc.1",
-    "=v3.7.2",
-    "=5.0.2",
-    ">1.2.3",
-    "<=2.4",
-    "<v1.2.3",
-    "<=v2.4.6",
-]
-expected_clean_semver = [
-    # npm
-    '3.0.0-rc.1',
-    '3.7.2',
-    '5.0.2',
-    '>1.2.3',
-    '<=2.4',
-    '<1.2.3',
-    '<=2.4.6'
-]
-before_trim = [
-    # npm
-    "<  2.0.5", "< 1.12.4 || >= 2.0.0 <2.0.2", "<= 0.0.1",
-    "<= 2.15.0 || >= 3.0.0 <= 3.8.2",
-    ">= 0.0.10 <= 0.0.14",
-    ">= 1.0.0-rc.1 <1.0.0-rc.1.1 || >= 1.0.0-rc.2 <1.0.0-rc.2.1 ",
-    # # composer
-    " >=8.0, <8.4.5",
-    "< 1.15.2",
-    ">0.7.1, <1.0.4",
-    ">= 3.1, <=3.1.9",
-    "< 2.1.27.9",
-
-    # ruby
-    "< 0.13.3, > 0.11.0",
-    "< 0.10.0",
-    "< 0.14.1.1, >= 0.13.3",
-    "< 1.0.0.rc1.1",
-    "< 1.3.0.pre.8",
-    "<0.30.0 ,>=0.27.0",
-    ">= 2.3.0, <= 2.3.10",
-
-]
-expected_comparator_trimmed = [
-    '<2.0.5',
-    '<1.12.4 || >=2.0.0 <2.0.2',
-    '<=0.0.1',
-    '<=2.15.0 || >=3.0.0 <=3.8.2',
-    '>=0.0.10 <=0.0.14',
-    '>=1.0.0-rc.1 <1.0.0-rc.1.1 || >=1.0.0-rc.2 <1.0.0-rc.2.1',
-    # composer
-    '>=8.0 <8.4.5',
-    '<1.15.2',
-    '>0.7.1 <1.0.4',
-    '>=3.1 <=3.1.9',
-    '<2.1.27.9',
-    # ruby
-    '<0.13.3 >0.11.0',
-    '<0.10.0',
-    '<0.14.1.1 >=0.13.3',
-    '<1.0.0.rc1.1',
-    '<1.3.0.pre.8',
-    '<0.30.0 >=0.27.0',
-    '>=2.3.0 <=2.3.10'
-
-]
-
 
 def test_create_from_semver():
     results = []
@@ -125,20 +58,6 @@ def test_transform_to_semver_comma_separated():
     assert (expected_comma_separated_semver_range == list(map(str, results)))
 
 
-def test_clean_semver():
-    results = []
-    for semver in before_clean:
-        results.append(utils._clean_semver(semver))
-    assert (expected_clean_semver == results)
-
-
-def test_comparator_trim():
-    results = []
-    for semver in before_trim:
-        results.append(utils._comparator_trim(semver))
-    assert (expected_comparator_trimmed == results)
-
-
 def test_transform_to_semver_failure():
     results = []
     for semver in test_npm_semver_ranges:
@@ -159,3 +78,50 @@ def test_create_from_semver_failure():
         except ValueError as msg:
             assert str(
                 msg) == 'Version ranges seems to already be maven version range'
+
+
+npm_semver_sugar = {
+    "^1.2.3": "[1.2.3,2.0.0)",
+    "^0.2.3": "[0.2.3,0.3.0)",
+    "^0.0.3": "[0.0.3,0.0.4)",
+    "^1.2.x": "[1.2.0,2.0.0)",
+    "~1.2.3": "[1.2.3,1.3.0)",
+    "~1.2": "[1.2.0,1.3.0)",
+    "~1": "[1.0.0,2.0.0)",
+    "1.2.x": "[1.2.0,1.3.0)",
+    "1.X": "[1.0.0,2.0.0)",
+    "x": "(,)",
+    ">1.x": "[2.0.0,)",
+    "<=1.2.x": "(,1.3.0)",
+    "1.2.3 - 2.3.4": "[1.2.3,2.3.4]",
+    "1.2 - 2.3": "[1.2.0,2.4.0)",
+    "=v1.2.3": "[1.2.3]",
+    "^1.2.3 || ~2.0.0": "[1.2.3,2.0.0),[2.0.0,2.1.0)",
+    # ruby
+    "~> 2.2": "[2.2,3)",
+    "~> 2.2.0": "[2.2.0,2.3)",
+    # composer
+    ">= 1.0, < 2.0 | ^3.0": "[1.0,2.0),[3.0.0,4.0.0)",
+}
+
+
+def test_create_from_semver_sugar():
+    results = {semver: str(utils.create_from_semver(semver))
+               for semver in npm_semver_sugar}
+    assert results == npm_semver_sugar
+
+
+def test_create_from_semver_invalid():
+    for semver in ["<", ">=1.0 <", "1.0 -", "^foo", ">=<1.0",
+                   "1.0 - - 2.0", "- 1.0", "1.0 || - 2.0", "1.0 -,2.0",
+                   "~> 1.x", "~> *"]:
+        try:
+            utils.create_from_semver(semver)
+            assert False, f'{semver} did not raise exception!'
+        except ValueError as msg:
+            assert 'Invalid' in str(msg)
+    try:
+        utils.create_from_semver("<1.0<2.0")
+        assert False, '<1.0<2.0 did not raise exception!'
+    except ValueError as msg:
+        assert str(msg) == 'semver range contains </> more than one time.'
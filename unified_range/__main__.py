@@ -0,0 +1,5 @@
+import sys
+
+from unified_range.cli import main
+
+sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Asyncio counterparts of the `api` filtering functions.
+
+Small inputs are computed inline. Ranges are parsed in batches of
+`YIELD_EVERY`, yielding to the event loop between batches, so medium
+inputs don't block other tasks for long and can be cancelled between
+batches. Indexing the versions and computing the intervals doesn't
+yield, so inputs of `EXECUTOR_VERSIONS` versions or more, and of
+`EXECUTOR_THRESHOLD` versions and ranges or more, are computed in an
+executor - the loop's default executor, or the one given
+(a `ProcessPoolExecutor` avoids holding the GIL of the loop's process).
+Cancelling a call that runs in an executor stops waiting for it, the
+computation itself runs to completion unless it didn't start yet.
+
+    filtered = await aio.filter_versions(versions, ranges, executor=pool)
+"""
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, List, Optional, Sized, Union
+
+from unified_range import api, utils
+from unified_range.models import UnifiedVersionRange, VersionIndex
+
+EXECUTOR_THRESHOLD = 50_000
+# indexing and filtering 10k versions blocks the loop for about a
+# millisecond
+EXECUTOR_VERSIONS = 10_000
+YIELD_EVERY = 500
+
+
+def _use_executor(asc_versions: Sized, ranges: Sized) -> bool:
+    return len(asc_versions) >= EXECUTOR_VERSIONS or \
+        len(asc_versions) + len(ranges) >= EXECUTOR_THRESHOLD
+
+
+async def _in_executor(executor: Optional[Executor], func: Callable, *args):
+    # the running loop (`get_running_loop` is python 3.7+)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, partial(func, *args))
+
+
+async def _parse_ranges(ranges: List[str]) -> List[UnifiedVersionRange]:
+    """
+    Parse ranges, yielding to the event loop every YIELD_EVERY ranges.
+    """
+    rngs_unified = []
+    for i, rng in enumerate(ranges, 1):
+        rngs_unified.append(api._parse_range(rng))
+        if i % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+    return rngs_unified
+
+
+async def filter_versions(asc_versions: Union[List[str], VersionIndex],
+                          ranges: List[str],
+                          executor: Optional[Executor] = None) -> List[str]:
+    """
+    Async `api.filter_versions`.
+    :param executor: executor for large inputs, defaults to the loop's
+    """
+    if _use_executor(asc_versions, ranges):
+        return await _in_executor(executor, api.filter_versions,
+                                  asc_versions, ranges)
+    rngs_unified = await _parse_ranges(ranges)
+    return utils.not_included_versions(asc_versions, rngs_unified)
+
+
+async def next_filtered_version(current_version: str,
+                                asc_versions: Union[List[str], VersionIndex],
+                                ranges: List[str],
+                                executor: Optional[Executor] = None) \
+        -> Optional[str]:
+    """
+    Async `api.next_filtered_version`.
+    :param executor: executor for large inputs, defaults to the loop's
+    """
+    if _use_executor(asc_versions, ranges):
+        return await _in_executor(executor, api.next_filtered_version,
+                                  current_version, asc_versions, ranges)
+    version_index = VersionIndex.of(asc_versions)
+    if current_version not in version_index:
+        raise ValueError('current_version given is not part of asc_version')
+    rngs_unified = await _parse_ranges(ranges)
+    return utils.next_not_included_version(version_index, rngs_unified,
+                                           current_version)
+
+
+async def maximum_filtered_version(asc_versions: Union[List[str],
+                                                       VersionIndex],
+                                   ranges: List[str],
+                                   executor: Optional[Executor] = None) \
+        -> Optional[str]:
+    """
+    Async `api.maximum_filtered_version`.
+    :param executor: executor for large inputs, defaults to the loop's
+    """
+    if _use_executor(asc_versions, ranges):
+        return await _in_executor(executor, api.maximum_filtered_version,
+                                  asc_versions, ranges)
+    rngs_unified = await _parse_ranges(ranges)
+    return utils.last_not_included_version(asc_versions, rngs_unified)
@@ -1,9 +1,14 @@
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
-from unified_range import utils
-
-from unified_range.models import UnifiedVersionRange
-from unified_range.utils import is_semver_range, is_unified_range
+from unified_range import cache, columnar, instrumentation, utils
+from unified_range.columnar import ConvertedColumn
+from unified_range.comparators import get_version_key
+from unified_range.instrumentation import Clock
+from unified_range.intervals import (IntervalSet, range_intervals,
+                                     version_position)
+from unified_range.matcher import RangeMatcher
+from unified_range.models import UnifiedVersionRange, VersionIndex
+from unified_range.universe import VersionUniverse, build_universe
 
 
 def from_semver(semver_spec: str) -> str:
@@ -12,7 +17,7 @@ def from_semver(semver_spec: str) -> str:
     :param semver_spec: str
     :return: unified_spec
     """
-    ver_rng = utils.create_from_semver(semver_spec)
+    ver_rng = cache.semver_cache(semver_spec)
     return str(ver_rng)
 
 
@@ -38,66 +43,201 @@ def to_semver_comma_separated(spec: str) -> str:
     return semver
 
 
+def from_semver_column(semver_specs) -> ConvertedColumn:
+    """
+    Convert a column of semver strings to unified range strings, converting
+    every distinct spec once - see `unified_range.columnar`.
+    :param semver_specs: sequence, NumPy (or buffer-protocol) array or
+        Arrow string array
+    :return: ConvertedColumn - the converted specs and the error mask
+    """
+    return columnar.from_semver(semver_specs)
+
+
+def to_semver_column(specs, separator: str = " ") -> ConvertedColumn:
+    """
+    Convert a column of unified range strings to semver strings, converting
+    every distinct spec once - see `unified_range.columnar`.
+    :param specs: sequence, NumPy (or buffer-protocol) array or Arrow
+        string array
+    :param separator: " " (`to_semver`) or ", "
+        (`to_semver_comma_separated`)
+    :return: ConvertedColumn - the converted specs and the error mask
+    """
+    return columnar.to_semver(specs, separator)
+
+
 def unified_range(spec: str) -> UnifiedVersionRange:
     """
     Return VersionRange for unified range.
     Only support unified range format.
+    Results are cached (see `unified_range.cache`) and immutable.
     :param spec: str
     :return: VersionRange instance
     """
-    return UnifiedVersionRange.create_from_spec(spec)
+    return cache.unified_cache(spec)
 
 
-def filter_versions(asc_versions: List[str], ranges: List[str]) -> List[str]:
+def filter_versions(asc_versions: Union[List[str], VersionIndex],
+                    ranges: List[str]) -> List[str]:
     """
     Return an ordered list of versions that not satisfies any range.
     Input versions must be ordered in ascending order and include all
     the versions that are specified in the ranges.
-    :param ord_versions:
+    :param asc_versions: list of versions or VersionIndex
     :param ranges:
     :return:
     """
-    rngs_unified = []
-    for rng in ranges:
-        if is_semver_range(rng):
-            rngs_unified.append(unified_range(from_semver(rng)))
-        elif is_unified_range(rng):
-            rngs_unified.append(unified_range(rng))
-        else:
-            raise ValueError(
-                f'Not a valid semver or unified/maven range - ({rng})')
+    clock = instrumentation.start("filter_versions")
+    rngs_unified = _parse_ranges(ranges, clock)
+    filtered = utils.not_included_versions(asc_versions, rngs_unified)
+    if clock is not None:
+        clock.stage("filter")
+        clock.done(versions=len(asc_versions), ranges=len(ranges))
+    return filtered
 
-    return utils.not_included_versions(asc_versions, rngs_unified)
 
+def iter_filter_versions(asc_versions: Iterable[str],
+                         ranges: List[str]) -> Iterator[str]:
+    """
+    Lazy `filter_versions` - consume ascending versions from any iterable
+    (e.g. a DB cursor) and yield the versions that not satisfies any range.
+    Ranges are parsed when called, versions missing from the iterable
+    raise ValueError once it is exhausted.
+    :param asc_versions: iterable of versions, in ascending order
+    :param ranges:
+    :return: iterator of versions
+    """
+    rngs_unified = [_parse_range(rng) for rng in ranges]
+    return utils.iter_not_included_versions(asc_versions, rngs_unified)
 
-def next_filtered_version(current_version: str, asc_versions: List[str],
+
+def _parse_range(rng: str) -> UnifiedVersionRange:
+    """
+    Parse a semver or unified range string to UnifiedVersionRange.
+    """
+    return cache.range_cache(rng)
+
+
+def _parse_ranges(ranges: List[str], clock: Optional[Clock] = None) \
+        -> List[UnifiedVersionRange]:
+    """
+    Parse range strings, timing the parsing stage when instrumented.
+    """
+    rngs_unified = [_parse_range(rng) for rng in ranges]
+    if clock is not None:
+        clock.stage("parse")
+    return rngs_unified
+
+
+def next_filtered_version(current_version: str,
+                          asc_versions: Union[List[str], VersionIndex],
                           ranges: List[str]) -> List[str]:
     """
     Return the first version that not satisfies any range.
     Input versions must be ordered in ascending order and include all
     the versions that are specified in the ranges.
+    `asc_versions` can be a list of versions or VersionIndex.
     """
-    if current_version not in asc_versions:
+    clock = instrumentation.start("next_filtered_version")
+    version_index = VersionIndex.of(asc_versions)
+    if current_version not in version_index:
         raise ValueError('current_version given is not part of asc_version')
-    minimal_version = None
-    index_current_version = asc_versions.index(current_version)
-    filtered_versions = filter_versions(asc_versions, ranges)
-    for v in filtered_versions:
-        if index_current_version <= asc_versions.index(v):
-            minimal_version = v
-            break
-    return minimal_version
+    rngs_unified = _parse_ranges(ranges, clock)
+    next_version = utils.next_not_included_version(
+        version_index, rngs_unified, current_version)
+    if clock is not None:
+        clock.stage("search")
+        clock.done(versions=len(version_index), ranges=len(ranges))
+    return next_version
 
 
-def maximum_filtered_version(asc_versions: List[str],
+def maximum_filtered_version(asc_versions: Union[List[str], VersionIndex],
                              ranges: List[str]) -> List[str]:
     """
     Return the first version that not satisfies any range.
     Input versions must be ordered in ascending order and include all
     the versions that are specified in the ranges.
+    `asc_versions` can be a list of versions or VersionIndex.
+    """
+    clock = instrumentation.start("maximum_filtered_version")
+    rngs_unified = _parse_ranges(ranges, clock)
+    maximum_version = utils.last_not_included_version(asc_versions,
+                                                      rngs_unified)
+    if clock is not None:
+        clock.stage("search")
+        clock.done(versions=len(asc_versions), ranges=len(ranges))
+    return maximum_version
+
+
+def batch_contains(versions_by_package: Dict[str, List[str]],
+                   ranges_by_package: Dict[str, List[str]],
+                   ecosystem=None) -> Dict[str, bytearray]:
+    """
+    Check many versions of many packages against their ranges at once.
+    Every range is parsed once, the ranges of a package are merged and
+    sorted once, and each version is looked up with a binary search, so
+    versions don't need to be ordered or include the range bounds.
+    :param versions_by_package: package -> versions to check
+    :param ranges_by_package: package -> semver or unified ranges
+    :param ecosystem: ecosystem name or version key callable,
+        see `unified_range.comparators`
+    :return: package -> bytearray aligned with the package's versions,
+        1 for versions included in any range (0 otherwise)
+    """
+    key = get_version_key(ecosystem)
+    parsed: Dict[str, UnifiedVersionRange] = {}
+    results: Dict[str, bytearray] = {}
+    for package, versions in versions_by_package.items():
+        ranges = ranges_by_package.get(package)
+        mask = bytearray(len(versions))
+        results[package] = mask
+        if not ranges:
+            continue
+        for rng in ranges:
+            if rng not in parsed:
+                parsed[rng] = _parse_range(rng)
+        interval_set = IntervalSet(
+            range_intervals((parsed[rng] for rng in ranges), key))
+        for i, version in enumerate(versions):
+            if version_position(key(version)) in interval_set:
+                mask[i] = 1
+    return results
+
+
+def compile(ranges: List[str], versions: Optional[Iterable[str]] = None,
+            ecosystem=None) -> RangeMatcher:
+    """
+    Parse, merge and sort a set of semver or unified ranges once, for
+    repeated evaluation - see `unified_range.matcher.RangeMatcher`.
+    Versions are compared with the ecosystem ordering, so unlike
+    `filter_versions` they don't need to include the range bounds.
+    :param ranges: semver or unified ranges
+    :param versions: the package versions (any order), used by
+        `next_safe` and `max_safe`
+    :param ecosystem: ecosystem name or version key callable,
+        see `unified_range.comparators`
+    :return: RangeMatcher
+    """
+    return RangeMatcher([_parse_range(rng) for rng in ranges], versions,
+                        ecosystem)
+
+
+def version_universe(versions: Iterable[str], ecosystem=None,
+                     ranges: Optional[List[str]] = None) -> VersionUniverse:
+    """
+    Sort the versions of a package for the filtering functions, see
+    `unified_range.universe`. The result is cached and can be passed as
+    `asc_versions` to `filter_versions`, `next_filtered_version` and
+    `maximum_filtered_version`.
+    :param versions: versions, in any order
+    :param ecosystem: ecosystem name or version key callable,
+        see `unified_range.comparators`
+    :param ranges: semver or unified ranges whose bound versions must be
+        in versions, ValueError is raised otherwise
+    :return: VersionUniverse
     """
-    filtered_versions = filter_versions(asc_versions, ranges)
-    if filtered_versions:
-        return filtered_versions[-1]
-    else:
-        return None
+    universe = build_universe(versions, ecosystem)
+    if ranges:
+        universe.validate(_parse_range(rng) for rng in ranges)
+    return universe
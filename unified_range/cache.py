@@ -0,0 +1,130 @@
+"""
+Bounded LRU caches in front of the range parsers.
+
+The same advisory range strings are parsed over and over, so `api` parses
+them through `unified_cache` (maven style specs), `semver_cache` (semver
+specs) and `range_cache` (either, for the filtering functions). Parsed
+models are immutable, so cached objects are safely shared.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, NamedTuple, Optional
+
+from unified_range import instrumentation, utils
+from unified_range.models import UnifiedVersionRange
+
+DEFAULT_MAXSIZE = 4096
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache(object):
+    """
+    LRU cache of `parse(spec)` results keyed by the raw spec string.
+    Errors raised by `parse` are not cached. A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, parse: Callable[[str], Optional[UnifiedVersionRange]],
+                 maxsize: int = DEFAULT_MAXSIZE, name: str = "parse_cache"):
+        if maxsize < 0:
+            raise ValueError("maxsize must be a non negative integer")
+        self.parse = parse
+        # operation name of the cache's instrumentation events
+        self.name = name
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Optional[UnifiedVersionRange]]" = \
+            OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, spec: str) -> Optional[UnifiedVersionRange]:
+        if not isinstance(spec, str):
+            # let the parser raise its own error for non string specs
+            return self.parse(spec)
+        with self._lock:
+            if spec in self._entries:
+                self._entries.move_to_end(spec)
+                self.hits += 1
+                result = self._entries[spec]
+                hit = True
+            else:
+                self.misses += 1
+                hit = False
+        if instrumentation.sink is not None:
+            instrumentation.count(self.name, "hits" if hit else "misses")
+        if hit:
+            return result
+        result = self.parse(spec)
+        if self._maxsize:
+            with self._lock:
+                self._entries[spec] = result
+                self._entries.move_to_end(spec)
+                self._evict()
+        return result
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def resize(self, maxsize: int):
+        """
+        Change the cache size, evicting least recently used entries if needed.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must be a non negative integer")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self._maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+unified_cache = ParseCache(UnifiedVersionRange.create_from_spec,
+                           name="unified_cache")
+semver_cache = ParseCache(utils.create_from_semver, name="semver_cache")
+range_cache = ParseCache(utils.create_from_range, name="range_cache")
+
+
+def set_maxsize(maxsize: int):
+    """
+    Set the size of the parse caches.
+    """
+    unified_cache.resize(maxsize)
+    semver_cache.resize(maxsize)
+    range_cache.resize(maxsize)
+
+
+def clear():
+    """
+    Clear the parse caches.
+    """
+    unified_cache.clear()
+    semver_cache.clear()
+    range_cache.clear()
@@ -0,0 +1,220 @@
+"""
+Bulk conversion between semver and unified ranges.
+
+Reads one range per line (or JSONL), converts the rows in chunks across a
+process pool and writes the results in input order. Rows that fail to
+convert are reported per row instead of aborting the run.
+
+    python -m unified_range from-semver -i ranges.txt -o unified.txt
+    python -m unified_range to-semver --format jsonl < unified.jsonl
+
+JSONL rows are a JSON string or an object with the range in `--field`
+(default "range"). Output rows are objects with the input fields, plus
+"result" or "error". In lines format a failed row is written as an empty
+line and its error to stderr as `<line number>: <error>`.
+The exit status is 1 if any row failed.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import (Callable, Iterable, Iterator, List, Optional, TextIO,
+                    Tuple)
+
+from unified_range import utils
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# (result, error) of a row, exactly one of them is None
+RowResult = Tuple[Optional[str], Optional[str]]
+
+
+def _from_semver(rng: str, separator: str) -> str:
+    return str(utils.create_from_semver(rng))
+
+
+def _to_semver(rng: str, separator: str) -> str:
+    return utils.transform_to_semver(rng, separator=separator)
+
+
+CONVERSIONS = {
+    "from-semver": _from_semver,
+    "to-semver": _to_semver,
+}
+
+
+def convert_chunk(conversion: str, separator: str,
+                  ranges: List[Optional[str]]) -> List[RowResult]:
+    """
+    Convert a chunk of ranges, in a worker process. None ranges are
+    skipped, empty (or whitespace only) ranges are errors.
+    :return: (result, error) for every range
+    """
+    convert = CONVERSIONS[conversion]
+    results: List[RowResult] = []
+    for rng in ranges:
+        if rng is None:
+            # the row couldn't be read
+            results.append((None, None))
+            continue
+        try:
+            if not rng.strip():
+                # the parsers read an empty semver range as all versions
+                raise ValueError("Empty range")
+            results.append((convert(rng, separator), None))
+        except ValueError as e:
+            results.append((None, str(e) or type(e).__name__))
+    return results
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    chunk = list(islice(rows, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, size))
+
+
+def ordered_map(executor: Optional[Executor], fn: Callable,
+                chunks: Iterable, window: int) -> Iterator:
+    """
+    Like `Executor.map`, but submit at most `window` chunks ahead of the
+    results being consumed, so input is read lazily. Without an executor
+    chunks are processed in the current process.
+    """
+    if executor is None:
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+    pending: deque = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(fn, chunk))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _read_rows(lines: Iterable[str], fmt: str, field: str) \
+        -> Iterator[Tuple[Optional[dict], Optional[str], Optional[str]]]:
+    """
+    Yield (row, range, error) of every input line - row is the JSON object
+    (or None) the output fields are added to, error is set (and range is
+    None) for JSONL lines that can't be read.
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if fmt == "lines":
+            yield None, line, None
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield {"line": line}, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(row, str):
+            yield {field: row}, row, None
+        elif isinstance(row, dict) and isinstance(row.get(field), str):
+            yield row, row[field], None
+        else:
+            yield {"line": line}, None, f"No {field} string in row"
+
+
+def run(lines: Iterable[str], output: TextIO, errors: TextIO,
+        conversion: str, fmt: str = "lines", separator: str = ", ",
+        field: str = "range", workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Convert the ranges of lines and write them to output, in input order.
+    :param workers: number of worker processes, 0 or 1 converts in the
+        current process. Defaults to the number of CPUs.
+    :return: number of rows that failed to convert
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    failed = 0
+    line_number = 0
+    chunks = _chunks(_read_rows(lines, fmt, field), chunk_size)
+    # the rows of the chunks in flight are kept to write the output
+    in_flight: deque = deque()
+
+    def _submitted() -> Iterator[List[Optional[str]]]:
+        for chunk in chunks:
+            in_flight.append(chunk)
+            yield [rng for _, rng, _ in chunk]
+
+    convert = partial(convert_chunk, conversion, separator)
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for results in ordered_map(executor, convert, _submitted(),
+                                   workers * 2):
+            chunk = in_flight.popleft()
+            for (row, _, read_error), (result, error) in zip(chunk, results):
+                line_number += 1
+                error = read_error or error
+                if error is not None:
+                    failed += 1
+                if fmt == "lines":
+                    output.write(f"{result if error is None else ''}\n")
+                    if error is not None:
+                        errors.write(f"{line_number}: {error}\n")
+                    continue
+                row = dict(row)
+                if error is None:
+                    row["result"] = result
+                else:
+                    row["error"] = error
+                output.write(json.dumps(row) + "\n")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="unified-range",
+        description="Convert ranges between semver and unified (maven) "
+                    "formats.")
+    parser.add_argument("conversion", choices=sorted(CONVERSIONS))
+    parser.add_argument("-i", "--input", default="-",
+                        help="input file, one range per line (default stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file (default stdout)")
+    parser.add_argument("--format", choices=("lines", "jsonl"),
+                        default="lines")
+    parser.add_argument("--field", default="range",
+                        help="range field of JSONL objects")
+    parser.add_argument("--separator", default=", ",
+                        help="separator of semver restrictions (to-semver)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per worker task")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+
+    input_file = sys.stdin if args.input == "-" else \
+        open(args.input, "r", encoding="utf-8")
+    output_file = sys.stdout if args.output == "-" else \
+        open(args.output, "w", encoding="utf-8")
+    try:
+        failed = run(input_file, output_file, sys.stderr, args.conversion,
+                     fmt=args.format, separator=args.separator,
+                     field=args.field, workers=args.workers,
+                     chunk_size=args.chunk_size)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    return 1 if failed else 0
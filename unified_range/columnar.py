@@ -0,0 +1,145 @@
+"""
+Columnar conversion between unified and semver ranges.
+
+`to_semver` and `from_semver` convert a whole column of range strings -
+a sequence, a NumPy array (or any buffer-protocol backed one), or an
+Arrow (chunked) string array. Identical specs are converted once:
+
+- Arrow arrays are dictionary encoded by Arrow, without converting every
+  row to a python string.
+- NumPy arrays are read at once with `tolist`, and like other sequences
+  deduplicated with a dict.
+
+Every distinct spec is converted with `utils.transform_to_semver` or
+`utils.create_from_semver`, and the results are spread back to the rows
+(with NumPy, when the row indices are an array), so converting a large
+column costs about as much as its distinct specs.
+
+    column = columnar.from_semver(df["range"].to_numpy())
+    df["unified"] = column.specs
+    failed = df[numpy.frombuffer(column.errors, dtype=bool)]
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:  # numpy is optional
+    numpy = None
+
+from unified_range import utils
+
+
+class ConvertedColumn(NamedTuple):
+    # the converted specs, aligned with the input rows - None for null
+    # (None or NaN) rows and rows that failed to convert
+    specs: List[Optional[str]]
+    # 1 for the rows that failed to convert, 0 otherwise
+    errors: bytearray
+    # distinct spec -> error message, for the specs that failed
+    messages: Dict[Any, str]
+
+
+def _array_rows(specs) -> Optional[list]:
+    """
+    Return the rows of a 1-d NumPy (or buffer-protocol backed) array as a
+    list, or None if specs isn't one.
+    """
+    if numpy is None or isinstance(specs, (list, tuple, str, bytes)):
+        return None
+    if not isinstance(specs, numpy.ndarray):
+        try:
+            memoryview(specs).release()
+        except TypeError:
+            return None
+        specs = numpy.asarray(specs)
+    if specs.ndim != 1:
+        return None
+    return specs.tolist()
+
+
+def _factorize(specs) -> Tuple[list, Any]:
+    """
+    Return the distinct specs, and for every row the index of its spec in
+    them - a NumPy array for Arrow arrays (when NumPy is installed), a list
+    otherwise.
+    """
+    if hasattr(specs, "dictionary_encode"):
+        # Arrow arrays, the chunks of an encoded ChunkedArray share the
+        # same dictionary.
+        encoded = specs.dictionary_encode()
+        chunks = encoded.chunks if hasattr(encoded, "chunks") else [encoded]
+        if not chunks:
+            return [], []
+        uniques = chunks[0].dictionary.to_pylist()
+        # null rows are indexed past the distinct specs
+        indices = [chunk.indices.fill_null(len(uniques)) for chunk in chunks]
+        uniques.append(None)
+        if numpy is not None:
+            return uniques, numpy.concatenate(
+                [chunk.to_numpy() for chunk in indices])
+        return uniques, [code for chunk in indices
+                         for code in chunk.to_pylist()]
+
+    rows = _array_rows(specs)
+    if rows is not None:
+        # hashing the python strings is faster than `numpy.unique`, which
+        # sorts them
+        specs = rows
+    index: Dict[Any, int] = {}
+    codes = [index.setdefault(spec, len(index)) for spec in specs]
+    return list(index), codes
+
+
+def _convert(convert: Callable[[str], str], specs) -> ConvertedColumn:
+    uniques, codes = _factorize(specs)
+    results: List[Optional[str]] = []
+    failed = bytearray(len(uniques))
+    messages: Dict[Any, str] = {}
+    for i, spec in enumerate(uniques):
+        if spec is None or spec != spec:
+            results.append(None)
+            continue
+        try:
+            results.append(convert(
+                spec.decode() if isinstance(spec, bytes) else spec))
+        except Exception as e:
+            results.append(None)
+            failed[i] = 1
+            messages[spec] = str(e) or type(e).__name__
+
+    if numpy is not None and isinstance(codes, numpy.ndarray):
+        converted = numpy.empty(len(results), dtype=object)
+        converted[:] = results
+        return ConvertedColumn(
+            converted[codes].tolist(),
+            bytearray(numpy.frombuffer(failed, dtype=numpy.uint8)[codes]),
+            messages)
+    return ConvertedColumn([results[code] for code in codes],
+                           bytearray(map(failed.__getitem__, codes)),
+                           messages)
+
+
+def to_semver(specs, separator: str = " ") -> ConvertedColumn:
+    """
+    Convert a column of unified range strings to semver strings, like
+    `api.to_semver` row by row.
+    :param specs: sequence, NumPy (or buffer-protocol) array or Arrow
+        string array of unified ranges
+    :param separator: separator of the restrictions' comparators,
+        see `api.to_semver_comma_separated`
+    :return: ConvertedColumn
+    """
+    return _convert(
+        lambda spec: utils.transform_to_semver(spec, separator=separator),
+        specs)
+
+
+def from_semver(specs) -> ConvertedColumn:
+    """
+    Convert a column of semver range strings to unified range strings,
+    like `api.from_semver` row by row.
+    :param specs: sequence, NumPy (or buffer-protocol) array or Arrow
+        string array of semver ranges
+    :return: ConvertedColumn
+    """
+    return _convert(lambda spec: str(utils.create_from_semver(spec)), specs)
@@ -0,0 +1,415 @@
+"""
+Version comparison keys per ecosystem.
+
+A version key turns a version string into an object that sorts like the
+ecosystem orders its versions, so a version can be checked against range
+bounds without a list of all the package versions. Keys are memoized, so
+the bounds of ranges that are evaluated repeatedly are parsed once.
+
+>>> get_version_key("maven")("1.0-alpha") < get_version_key("maven")("1.0")
+True
+"""
+import re
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+VersionKey = Callable[[str], Any]
+
+KEY_CACHE_SIZE = 65536
+
+
+def _invalid(ecosystem: str, version) -> ValueError:
+    return ValueError(f"Invalid {ecosystem} version: {version!r}")
+
+
+def _split_identifiers(identifiers: str) -> Tuple[tuple, ...]:
+    # numeric identifiers sort before alphanumeric ones
+    return tuple((0, int(i), "") if i.isdigit() else (1, 0, i)
+                 for i in identifiers.split("."))
+
+
+_SEMVER_RE = re.compile(
+    r"^\s*[v=]?\s*(\d+(?:\.\d+)*)"
+    r"(?:[-.]?([0-9A-Za-z][0-9A-Za-z.-]*?))?"
+    r"(?:\+[0-9A-Za-z.-]*)?\s*$")
+
+
+def _plain_release(version: str) -> Optional[Tuple[int, ...]]:
+    """
+    Fast path of the keys for plain `X.Y.Z` versions, the vast majority -
+    the release parts without trailing zeros, None for other versions.
+    """
+    parts = version.split(".")
+    # ascii digits only, the other decimal characters are all above "9"
+    if not all(map(str.isdecimal, parts)) or max(version) > "9":
+        return None
+    release = [int(part) for part in parts]
+    while release and release[-1] == 0:
+        release.pop()
+    return tuple(release)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def semver_key(version: str) -> tuple:
+    """
+    Key following https://semver.org/#spec-item-11, loosened to accept
+    any number of release parts (`2.0.20180219`, `1.0.0.rc1`).
+    """
+    release = _plain_release(version)
+    if release is not None:
+        return release, (1,)
+    match = _SEMVER_RE.match(version)
+    if not match:
+        raise _invalid("semver", version)
+    release = [int(part) for part in match.group(1).split(".")]
+    while release and release[-1] == 0:
+        release.pop()
+    prerelease = match.group(2)
+    if prerelease is None:
+        # a release sorts after all of its pre-releases
+        return tuple(release), (1,)
+    return tuple(release), (0,) + _split_identifiers(prerelease)
+
+
+_MAVEN_QUALIFIERS = ("alpha", "beta", "milestone", "rc", "snapshot", "", "sp")
+_MAVEN_ALIASES = {"ga": "", "final": "", "release": "", "cr": "rc"}
+_MAVEN_RELEASE = str(_MAVEN_QUALIFIERS.index(""))
+
+
+def _maven_qualifier(value: str, followed_by_digit: bool) -> str:
+    if followed_by_digit and len(value) == 1:
+        value = {"a": "alpha", "b": "beta", "m": "milestone"}.get(value, value)
+    value = _MAVEN_ALIASES.get(value, value)
+    if value in _MAVEN_QUALIFIERS:
+        return str(_MAVEN_QUALIFIERS.index(value))
+    # unknown qualifiers sort after the known ones, lexically
+    return f"{len(_MAVEN_QUALIFIERS)}-{value}"
+
+
+def _maven_is_null(item) -> bool:
+    if isinstance(item, int):
+        return item == 0
+    if isinstance(item, str):
+        return item == _MAVEN_RELEASE
+    return not item
+
+
+def _maven_normalize(items: list) -> tuple:
+    for i in range(len(items) - 1, -1, -1):
+        if _maven_is_null(items[i]):
+            del items[i]
+        elif not isinstance(items[i], tuple):
+            break
+    return tuple(items)
+
+
+def _maven_parse(version: str) -> tuple:
+    """
+    Port of maven's `ComparableVersion.parseVersion`. Integers are kept as
+    int, qualifiers as their comparable string and sub lists as tuples.
+    """
+    version = version.lower()
+    root: list = []
+    items = root
+    # (parent list, index of the sub list in parent) of each open sub list
+    stack = []
+    is_digit = False
+    start = 0
+
+    def _item(digit: bool, buf: str):
+        return int(buf) if digit else _maven_qualifier(buf, False)
+
+    def _open_sublist():
+        sublist: list = []
+        items.append(sublist)
+        stack.append((items, len(items) - 1))
+        return sublist
+
+    for i, c in enumerate(version):
+        if c == ".":
+            items.append(0 if i == start else _item(is_digit, version[start:i]))
+            start = i + 1
+        elif c == "-":
+            items.append(0 if i == start else _item(is_digit, version[start:i]))
+            start = i + 1
+            items = _open_sublist()
+        elif c.isdigit():
+            if not is_digit and i > start:
+                items.append(_maven_qualifier(version[start:i], True))
+                start = i
+                items = _open_sublist()
+            is_digit = True
+        else:
+            if is_digit and i > start:
+                items.append(int(version[start:i]))
+                start = i
+                items = _open_sublist()
+            is_digit = False
+    if len(version) > start:
+        items.append(_item(is_digit, version[start:]))
+
+    # normalize the innermost lists first, freezing them into tuples
+    while stack:
+        parent, index = stack.pop()
+        parent[index] = _maven_normalize(parent[index])
+    return _maven_normalize(root)
+
+
+def _cmp(left, right) -> int:
+    return (left > right) - (left < right)
+
+
+def _maven_cmp(item, other) -> int:
+    """
+    Compare two maven items, `other` may be None (missing item).
+    """
+    if isinstance(item, int):
+        if other is None:
+            return 0 if item == 0 else 1
+        if isinstance(other, int):
+            return _cmp(item, other)
+        return 1
+    if isinstance(item, str):
+        if other is None:
+            return _cmp(item, _MAVEN_RELEASE)
+        if isinstance(other, int):
+            return -1
+        if isinstance(other, str):
+            return _cmp(item, other)
+        return -1
+    if other is None:
+        for i in item:
+            result = _maven_cmp(i, None)
+            if result:
+                return result
+        return 0
+    if isinstance(other, (int, str)):
+        return -1 if isinstance(other, int) else 1
+    for left, right in zip_longest(item, other):
+        if left is None:
+            result = -_maven_cmp(right, None)
+        else:
+            result = _maven_cmp(left, right)
+        if result:
+            return result
+    return 0
+
+
+class MavenKey(object):
+    """
+    Comparison key of maven's ComparableVersion. Maven compares missing
+    items with rules that depend on the other item's type, which a plain
+    tuple can't express, so comparisons walk the parsed items.
+    """
+    __slots__ = ("items",)
+
+    def __init__(self, items: tuple):
+        self.items = items
+
+    def __eq__(self, other):
+        if not isinstance(other, MavenKey):
+            return NotImplemented
+        return self.items == other.items or \
+            _maven_cmp(self.items, other.items) == 0
+
+    def __lt__(self, other):
+        return _maven_cmp(self.items, other.items) < 0
+
+    def __le__(self, other):
+        return _maven_cmp(self.items, other.items) <= 0
+
+    def __gt__(self, other):
+        return _maven_cmp(self.items, other.items) > 0
+
+    def __ge__(self, other):
+        return _maven_cmp(self.items, other.items) >= 0
+
+    def __hash__(self):
+        return hash(self.items)
+
+    def __repr__(self):
+        return f"MavenKey({self.items!r})"
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def maven_key(version: str) -> MavenKey:
+    """
+    Key following maven's ComparableVersion, see
+    https://maven.apache.org/pom.html#version-order-specification
+    """
+    if not isinstance(version, str) or not version.strip():
+        raise _invalid("maven", version)
+    return MavenKey(_maven_parse(version.strip()))
+
+
+_PEP440_RE = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE)
+_PEP440_PRE = {"a": 0, "alpha": 0, "b": 1, "beta": 1,
+               "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def pep440_key(version: str) -> tuple:
+    """
+    Key following https://peps.python.org/pep-0440/#summary-of-permitted-suffixes-and-relative-ordering
+    """
+    release = _plain_release(version)
+    if release is not None:
+        return 0, release, (3, 0), -1, (1, 0), (0,)
+    match = _PEP440_RE.match(version)
+    if not match:
+        raise _invalid("pep440", version)
+    epoch = int(match.group("epoch") or 0)
+    release = [int(part) for part in match.group("release").split(".")]
+    while release and release[-1] == 0:
+        release.pop()
+    has_post = match.group("post") is not None
+    has_dev = match.group("dev") is not None
+    if match.group("pre"):
+        pre = (_PEP440_PRE[match.group("pre_l").lower()],
+               int(match.group("pre_n") or 0))
+    elif has_dev and not has_post:
+        # `1.0.dev0` sorts before `1.0a0`
+        pre = (-1, 0)
+    else:
+        pre = (3, 0)
+    post = int(match.group("post_n1") or match.group("post_n2") or 0) \
+        if has_post else -1
+    dev = (0, int(match.group("dev_n") or 0)) if has_dev else (1, 0)
+    local = match.group("local")
+    if local is None:
+        local_key: tuple = (0,)
+    else:
+        local_key = (1, tuple(
+            (1, int(part), "") if part.isdigit() else (0, 0, part.lower())
+            for part in re.split(r"[-_.]", local)))
+    return epoch, tuple(release), pre, post, dev, local_key
+
+
+_RUBYGEMS_RE = re.compile(
+    r"^\s*([0-9]+(?:\.[0-9a-zA-Z]+)*(?:-[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?)?\s*$")
+_RUBYGEMS_SEGMENT_RE = re.compile(r"[0-9]+|[a-z]+", re.IGNORECASE)
+_RUBYGEMS_PAD = (1, 0, "")
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def rubygems_key(version: str) -> tuple:
+    """
+    Key following `Gem::Version#<=>`: strings sort before numbers and
+    missing segments count as 0.
+    """
+    match = _RUBYGEMS_RE.match(version)
+    if not match:
+        raise _invalid("rubygems", version)
+    version = (match.group(1) or "0").replace("-", ".pre.")
+    # canonical segments: trailing zeros of every group are dropped, where a
+    # new group starts at each string segment.
+    segments = []
+    group_start = 0
+    for segment in _RUBYGEMS_SEGMENT_RE.findall(version):
+        if segment.isdigit():
+            segments.append((1, int(segment), ""))
+        else:
+            while len(segments) > group_start and \
+                    segments[-1] == _RUBYGEMS_PAD:
+                segments.pop()
+            group_start = len(segments)
+            segments.append((0, 0, segment))
+    while len(segments) > group_start and segments[-1] == _RUBYGEMS_PAD:
+        segments.pop()
+    # compare remaining segments of a longer version against the padding
+    segments.append(_RUBYGEMS_PAD)
+    return tuple(segments)
+
+
+_COMPOSER_RE = re.compile(
+    r"^\s*v?(\d+(?:\.(?:\d+|[x*])){0,3})"
+    r"(?:[._-]?(stable|beta|b|rc|alpha|a|patch|pl|p)((?:[.-]?\d+)*))?"
+    r"([.-]?dev)?(?:\+[0-9A-Za-z.-]*)?\s*$",
+    re.IGNORECASE)
+_COMPOSER_STABILITIES = {"alpha": 1, "a": 1, "beta": 2, "b": 2, "rc": 3,
+                         "stable": 4, "patch": 5, "pl": 5, "p": 5}
+# composer normalizes the `x` of `1.0.x-dev` to 9999999
+_COMPOSER_WILDCARD = 9999999
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def composer_key(version: str) -> tuple:
+    """
+    Key following composer's normalized versions: `dev` < `alpha` < `beta`
+    < `RC` < stable < `patch` releases, a `-dev` suffix sorts before the
+    version it's added to and `dev-<branch>` versions sort before all the
+    numbered ones.
+    """
+    # composer versions have up to 4 release parts
+    release = _plain_release(version) if version.count(".") < 4 else None
+    if release is not None:
+        return 1, release, 4, (), 1
+    stripped = version.strip()
+    if stripped.lower().startswith("dev-") and len(stripped) > 4:
+        return 0, stripped[4:]
+    match = _COMPOSER_RE.match(version)
+    if not match:
+        raise _invalid("composer", version)
+    release_parts = [_COMPOSER_WILDCARD if part in ("x", "X", "*")
+                     else int(part)
+                     for part in match.group(1).split(".")]
+    while release_parts and release_parts[-1] == 0:
+        release_parts.pop()
+    stability = match.group(2)
+    is_dev = match.group(4) is not None
+    if stability is None:
+        # `1.0.0-dev` sorts before `1.0.0-alpha`
+        return 1, tuple(release_parts), 0 if is_dev else 4, (), 1
+    numbers = tuple(int(number) for number in
+                    re.findall(r"\d+", match.group(3) or ""))
+    return (1, tuple(release_parts),
+            _COMPOSER_STABILITIES[stability.lower()], numbers,
+            0 if is_dev else 1)
+
+
+ECOSYSTEMS: Dict[str, VersionKey] = {
+    "semver": semver_key,
+    "npm": semver_key,
+    "maven": maven_key,
+    "pep440": pep440_key,
+    "pypi": pep440_key,
+    "rubygems": rubygems_key,
+    "composer": composer_key,
+    "packagist": composer_key,
+}
+DEFAULT_ECOSYSTEM = "semver"
+
+
+def register_ecosystem(name: str, key: VersionKey):
+    """
+    Register (or replace) the version key used for an ecosystem name.
+    """
+    if not callable(key):
+        raise ValueError("key must be callable")
+    ECOSYSTEMS[name.lower()] = key
+
+
+def get_version_key(ecosystem: Union[str, VersionKey, None] = None) \
+        -> VersionKey:
+    """
+    Return the version key for an ecosystem name. A callable is returned
+    as is, None returns the default (semver) key.
+    """
+    if ecosystem is None:
+        ecosystem = DEFAULT_ECOSYSTEM
+    if callable(ecosystem):
+        return ecosystem
+    try:
+        return ECOSYSTEMS[ecosystem.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown ecosystem: {ecosystem}")
@@ -0,0 +1,229 @@
+"""
+Range dialect detection and the lexers of the range parsers.
+
+`detect` classifies a range string by its operators and separators:
+
+    npm         `>=1.2.3 <2.0.0 || ^3.0.0`, `1.2.3 - 2.3.4`
+    ruby        `~> 1.2`, `>= 1.0, < 2.0`
+    composer    `>=1.0,<2.0 | ^3.0`
+    maven       `[1.2.3,2.0.0),[3.0.0,)`
+    wildcard    `*`, `1.2.x`
+    exact       `1.2.3`
+
+and `classify` also returns the string's token stream, which the parsers
+(`UnifiedVersionRange.create_from_spec`, `utils.create_from_semver`)
+consume directly:
+
+    maven       (restriction text, inclusive lower, text between the
+                brackets, inclusive upper) of every restriction
+                (see `lex_unified`)
+    otherwise   the `||` separated lists of (operator, version) comparators
+"""
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from unified_range import speedups
+
+NPM = "npm"
+RUBY = "ruby"
+COMPOSER = "composer"
+MAVEN = "maven"
+WILDCARD = "wildcard"
+EXACT = "exact"
+
+# dialects parsed by `utils.create_from_semver`
+SEMVER_DIALECTS = frozenset((NPM, RUBY, COMPOSER, WILDCARD))
+
+# the characters of `utils.semver_operators` and `utils.unified_operators`
+_OPERATOR_RE = re.compile(r"[<>=^~()\[\]]")
+_SEMVER_OPERATOR_RE = re.compile(r"[<>=^~]")
+_UNIFIED_OPERATOR_RE = re.compile(r"[()\[\]]")
+
+_COMPOSER_OR_RE = re.compile(r"(?<!\|)\|(?!\|)")
+# ruby puts a space between the operators and the versions
+_SPACED_OPERATOR_RE = re.compile(r"[<>=~]\s")
+_HYPHEN_RE = re.compile(r"\s-(?:\s|$)")
+_WILDCARD_RE = re.compile(r"\s*(?:\d+\.){0,2}[xX*](?:\.[xX*]){0,2}\s*")
+
+Comparators = List[List[Tuple[Optional[str], str]]]
+UnifiedToken = Tuple[Optional[str], bool, str, bool]
+
+
+class Classified(NamedTuple):
+    dialect: str
+    tokens: Union[Comparators, List[UnifiedToken]]
+
+
+def operator_families(spec: str) -> Tuple[bool, bool]:
+    """
+    Return whether spec has semver operators and unified (bracket)
+    operators. A single scan - up to the first operator, then the rest of
+    spec for the other family.
+    """
+    match = _OPERATOR_RE.search(spec)
+    if match is None:
+        return False, False
+    if match.group() in "()[]":
+        return _SEMVER_OPERATOR_RE.search(spec, match.end()) is not None, True
+    return True, _UNIFIED_OPERATOR_RE.search(spec, match.end()) is not None
+
+
+def detect(spec: str) -> Optional[str]:
+    """
+    Return the dialect of a range string, or None if it is neither a
+    semver nor a maven range (e.g. mixes their operators).
+    """
+    has_semver, has_unified = operator_families(spec)
+    if has_unified:
+        return None if has_semver else MAVEN
+    if has_semver:
+        if "~>" in spec:
+            return RUBY
+        if "|" in spec and _COMPOSER_OR_RE.search(spec):
+            return COMPOSER
+        if "," in spec:
+            return RUBY if _SPACED_OPERATOR_RE.search(spec) else COMPOSER
+        return NPM
+    if "||" in spec or _HYPHEN_RE.search(spec):
+        return NPM
+    if "," in spec or "|" in spec:
+        return None
+    if _WILDCARD_RE.fullmatch(spec):
+        return WILDCARD
+    stripped = spec.strip()
+    if stripped and len(stripped.split()) == 1:
+        return EXACT
+    return None
+
+
+def classify(spec: str) -> Classified:
+    """
+    Return the dialect and the tokens of a range string.
+    """
+    dialect = detect(spec)
+    if dialect is None:
+        raise ValueError(
+            f'Not a valid semver or unified/maven range - ({spec})')
+    if dialect == MAVEN:
+        return Classified(dialect, list(lex_unified(spec)))
+    return Classified(dialect, lex_semver(spec))
+
+
+# a restriction `[x,y]` up to the first closing bracket, and the separator
+# (optional comma and spaces) after it.
+_RESTRICTION_RE = re.compile(r"([\[(])([^\])]*)([\])])")
+_SEPARATOR_RE = re.compile(r"\s*(?:,\s*)?")
+
+
+def lex_unified(spec: str) -> Iterator[UnifiedToken]:
+    """
+    Lex a maven range string in a single pass, yielding (restriction text,
+    inclusive lower, text between the brackets, inclusive upper) for every
+    restriction, or (None, False, version, False) for a recommended
+    version. Errors report the position (in spec) of the restriction that
+    failed.
+    """
+    process = spec.strip()
+    offset = len(spec) - len(spec.lstrip())
+
+    if not process.startswith(("(", "[")) and not process.endswith(
+            (")", "]")):
+        raise ValueError("Recommended Version is currently not supported.")
+    pos = 0
+    while process.startswith(("[", "("), pos):
+        match = _RESTRICTION_RE.match(process, pos)
+        if match is None:
+            raise ValueError("Unbounded range: {} (at position {})".format(
+                spec, offset + pos))
+        yield (match.group(), match.group(1) == "[", match.group(2),
+               match.group(3) == "]")
+        pos = _SEPARATOR_RE.match(process, match.end()).end()
+    if pos < len(process):
+        if pos > 0:
+            raise ValueError(
+                "Only fully-qualified sets allowed in multiple set scenario: {} (at position {})".format(
+                    spec, offset + pos))
+        else:
+            yield None, False, process, False
+
+
+# a single pass over a semver range string: `||` (or composer's `|`),
+# `,` separators and comparators - an optional operator and a version.
+# A hyphen range's `-` is lexed as a version surrounded by spaces.
+_SEMVER_TOKEN_RE = re.compile(r"""
+    \s*(?:
+    (?P<or>\|\|?)
+    |(?P<and>,)
+    |(?P<op>~>|<=|>=|<|>|=|\^|~)?\s*(?P<version>[^\s,|<>=^~]+)
+    |(?P<dangling>~>|<=|>=|<|>|=|\^|~)
+    )""", re.VERBOSE)
+
+
+def lex_semver(semver: str) -> Comparators:
+    """
+    Lex semver range string to its `||` separated lists of (operator,
+    version) comparators. Hyphen ranges use the `-` and `--` operators
+    for their lower and upper versions.
+    """
+    alternatives: Comparators = [[]]
+    comparators = alternatives[0]
+    hyphen = False
+    # end of the previous comparator, -1 after a separator
+    last_end = -1
+    for match in _SEMVER_TOKEN_RE.finditer(semver):
+        kind = match.lastgroup
+        if kind != "version":
+            if kind == "dangling" or hyphen:
+                raise ValueError(
+                    f"Invalid semver range: {semver} (operator without version)")
+            if kind == "or":
+                comparators = []
+                alternatives.append(comparators)
+            last_end = -1
+            continue
+
+        op, version = match.group("op", "version")
+        if op is not None and match.start("op") == last_end:
+            if "<" in op or ">" in op:
+                raise ValueError(
+                    "semver range contains </> more than one time.")
+            raise ValueError(
+                f"Invalid semver range: {semver} (at position {match.start()})")
+        follows_comparator = op is None and last_end >= 0
+        last_end = match.end()
+        if hyphen:
+            if version == "-":
+                # `1.0 - - 2.0`
+                raise ValueError(
+                    f"Invalid semver range: {semver} (hyphen without version)")
+            comparators.append(("--", version))
+            hyphen = False
+        elif follows_comparator and comparators[-1][0] not in (None, "-"):
+            # text after a comparator belongs to its version -
+            # `<6.19 .0`, `<5.2.5 final`
+            comparators[-1] = (comparators[-1][0],
+                               comparators[-1][1] + version)
+        elif follows_comparator and version == "-" and \
+                semver[last_end:last_end + 1] in ("", " ", "\t"):
+            comparators[-1] = ("-", comparators[-1][1])
+            hyphen = True
+        else:
+            if op is None and version == "-":
+                # `- 1.0`, `1.0 -,2.0`
+                raise ValueError(
+                    f"Invalid semver range: {semver} (hyphen without version)")
+            if version[0] in "vV" and version[1:2].isdigit() and \
+                    op not in ("<", "<=", ">", ">="):
+                # `=v1.2.3`, `^v1.2.3`, comparison bounds are kept as
+                # is since they have to match the versions list
+                version = version[1:]
+            comparators.append((op, version))
+    if hyphen:
+        raise ValueError(
+            f"Invalid semver range: {semver} (operator without version)")
+    return alternatives
+
+
+# the compiled lexers, when they are built (see `unified_range.speedups`)
+lex_unified = speedups.kernel("lex_unified", lex_unified)
+lex_semver = speedups.kernel("lex_semver", lex_semver)
@@ -0,0 +1,234 @@
+"""
+Incremental filtering of a package's versions.
+
+`api.filter_versions` recomputes everything from the versions list and the
+ranges. An `IncrementalFilter` keeps the state of one package instead -
+its versions sorted by their ecosystem positions (see
+`unified_range.intervals`), the intervals of every range and how many
+ranges include each version - and updates it when a version is published
+or a range is added or removed:
+
+- `add_version` finds the version's place with a binary search and counts
+  the intervals that include it with binary searches of their sorted start
+  and end positions, O(log V + log R), then inserts it into the version
+  lists, O(V).
+- `add_range` and `remove_range` binary search the versions of the range's
+  intervals and only update those, O(log V + delta), and insert (or
+  delete) the interval bounds in the sorted start and end lists, O(R).
+
+The O(V) and O(R) steps are list inserts and deletes - moving pointers,
+without comparing or evaluating versions and ranges again.
+
+Answers match `api.filter_versions`, `api.next_filtered_version` and
+`api.maximum_filtered_version` on the current versions and ranges, given
+the versions are in ascending ecosystem order:
+
+    evaluator = IncrementalFilter(asc_versions, ranges, "npm")
+    evaluator.add_version("2.0.1")
+    evaluator.add_range(">=2.0.0 <2.0.2")
+    evaluator.not_included(), evaluator.max_safe()
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from itertools import accumulate, compress
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from unified_range import api
+from unified_range.comparators import get_version_key
+from unified_range.intervals import (KeyInterval, range_intervals,
+                                     version_position)
+from unified_range.models import UnifiedVersionRange
+
+
+class IncrementalFilter(object):
+    """
+    Versions and ranges of a package, with the versions that are not
+    included in any of the ranges kept up to date.
+    Versions with equal ecosystem keys (e.g. `1.0` and `1.0.0`) can't be
+    told apart by position, so they are rejected.
+    """
+
+    def __init__(self, asc_versions: Iterable[str] = (),
+                 ranges: Iterable[str] = (), ecosystem=None):
+        """
+        :param asc_versions: versions in ascending ecosystem order
+        :param ranges: semver or unified ranges
+        :param ecosystem: ecosystem name or a version key callable,
+            defaults to semver.
+        """
+        self._key = get_version_key(ecosystem)
+        self._versions: List[str] = []
+        self._positions: List[tuple] = []
+        # number of ranges that include every version
+        self._depth: List[int] = []
+        # 1 for the versions that are not included in any range
+        self._not_included = bytearray()
+        # start and end positions of the intervals of all the ranges
+        self._starts: List[tuple] = []
+        self._ends: List[tuple] = []
+        self._ranges: Counter = Counter()
+        self._intervals: Dict[str, List[KeyInterval]] = {}
+
+        for version in asc_versions:
+            position = self._position(version)
+            if self._positions and not self._positions[-1] < position:
+                raise ValueError(
+                    f"Versions must be distinct and in ascending order: "
+                    f"{self._versions[-1]}, {version}")
+            self._versions.append(version)
+            self._positions.append(position)
+        # count the ranges of every version at once, with the running sum
+        # of +1 at the start and -1 at the end of every interval
+        changes = [0] * (len(self._versions) + 1)
+        for rng in ranges:
+            for interval in self._register(rng):
+                first, last = self._slice(interval)
+                changes[first] += 1
+                changes[last] -= 1
+        self._depth = list(accumulate(changes))[:-1]
+        self._not_included = bytearray(0 if depth else 1
+                                       for depth in self._depth)
+
+    def _position(self, version: str) -> tuple:
+        return version_position(self._key(version))
+
+    def _index(self, version: str) -> Optional[int]:
+        """
+        Return the index of version, or None if it isn't in the list.
+        """
+        index = bisect_left(self._positions, self._position(version))
+        if index < len(self._versions) and self._versions[index] == version:
+            return index
+        return None
+
+    @property
+    def versions(self) -> List[str]:
+        """
+        The versions, in ascending order.
+        """
+        return list(self._versions)
+
+    @property
+    def ranges(self) -> List[str]:
+        return list(self._ranges.elements())
+
+    def add_version(self, version: str):
+        """
+        Insert a new version at its place in the ecosystem order.
+        """
+        position = self._position(version)
+        index = bisect_left(self._positions, position)
+        if index < len(self._positions) and \
+                self._positions[index] == position:
+            raise ValueError(
+                f"Version {version} is equal to {self._versions[index]}, "
+                f"which is already in the versions list")
+        # intervals are half-open, [start, end) includes position when
+        # start <= position < end, and every interval ending at or before
+        # position also starts before it.
+        depth = bisect_right(self._starts, position) - \
+            bisect_right(self._ends, position)
+        self._versions.insert(index, version)
+        self._positions.insert(index, position)
+        self._depth.insert(index, depth)
+        self._not_included.insert(index, 0 if depth else 1)
+
+    def _check_bounds(self, rng: UnifiedVersionRange):
+        # like `api.filter_versions`, bound versions must be in the list
+        for rst in rng.restrictions:
+            for bound in rst.bounds:
+                if bound.version is not None and \
+                        self._index(bound.version) is None:
+                    raise ValueError(
+                        f"Version {bound.version} couldn't be found in the "
+                        f"versions list {self._versions}")
+
+    def _slice(self, interval: KeyInterval) -> Tuple[int, int]:
+        """
+        Return the [first, last) indices of the versions in interval.
+        """
+        first = bisect_left(self._positions, interval.start)
+        return first, bisect_left(self._positions, interval.end, first)
+
+    def _update(self, intervals: List[KeyInterval], change: int):
+        for interval in intervals:
+            for index in range(*self._slice(interval)):
+                depth = self._depth[index] = self._depth[index] + change
+                self._not_included[index] = 0 if depth else 1
+
+    def _register(self, rng: str) -> List[KeyInterval]:
+        """
+        Parse and record a range, return its intervals.
+        """
+        intervals = self._intervals.get(rng)
+        if intervals is None:
+            parsed = api._parse_range(rng)
+            self._check_bounds(parsed)
+            # merged, so every range counts once per version
+            intervals = self._intervals[rng] = range_intervals([parsed],
+                                                               self._key)
+        self._ranges[rng] += 1
+        for interval in intervals:
+            insort(self._starts, interval.start)
+            insort(self._ends, interval.end)
+        return intervals
+
+    def add_range(self, rng: str):
+        """
+        Add a semver or unified range, the same range can be added more
+        than once.
+        """
+        self._update(self._register(rng), 1)
+
+    def remove_range(self, rng: str):
+        """
+        Remove a range that was added, once.
+        """
+        if not self._ranges[rng]:
+            raise ValueError(f"Range {rng} wasn't added")
+        self._ranges[rng] -= 1
+        intervals = self._intervals[rng]
+        if not self._ranges[rng]:
+            del self._ranges[rng]
+            del self._intervals[rng]
+        for interval in intervals:
+            del self._starts[bisect_left(self._starts, interval.start)]
+            del self._ends[bisect_left(self._ends, interval.end)]
+        self._update(intervals, -1)
+
+    def matches(self, version: str) -> bool:
+        """
+        Check if a version of the list is included in any of the ranges.
+        """
+        index = self._index(version)
+        if index is None:
+            raise ValueError(f"{version!r} is not in the versions list")
+        return not self._not_included[index]
+
+    def not_included(self) -> List[str]:
+        """
+        Return the versions that are not included in any of the ranges,
+        like `api.filter_versions`.
+        """
+        return list(compress(self._versions, self._not_included))
+
+    def next_safe(self, current_version: str) -> Optional[str]:
+        """
+        Return the first version, from current_version onwards, that is not
+        included in any of the ranges, like `api.next_filtered_version`.
+        :param current_version: version from the versions list
+        """
+        index = self._index(current_version)
+        if index is None:
+            raise ValueError(
+                'current_version given is not part of asc_version')
+        index = self._not_included.find(1, index)
+        return None if index < 0 else self._versions[index]
+
+    def max_safe(self) -> Optional[str]:
+        """
+        Return the last version that is not included in any of the ranges,
+        like `api.maximum_filtered_version`.
+        """
+        index = self._not_included.rfind(1)
+        return None if index < 0 else self._versions[index]
@@ -0,0 +1,185 @@
+"""
+Opt-in instrumentation of the hot paths.
+
+When a sink is enabled, `api`, `utils`, `models` and the parse caches
+report events - per-stage timings (parsing, index lookups, interval
+building, output), input sizes and cache hits/misses.
+A sink is any callable that takes an `Event`, e.g. `Aggregator`, which
+keeps in-memory statistics and renders them in the Prometheus text format.
+
+    aggregator = instrumentation.Aggregator()
+    instrumentation.enable(aggregator)
+    api.filter_versions(versions, ranges)
+    print(aggregator.to_prometheus())
+    instrumentation.disable()
+
+While disabled (the default), instrumented functions only check that no
+sink is set.
+"""
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+
+class Event(NamedTuple):
+    # "timing" (seconds), "size" or "count"
+    kind: str
+    # the instrumented function, or cache
+    operation: str
+    # stage, input or counter name
+    name: str
+    value: float
+
+
+Sink = Callable[[Event], None]
+
+# the enabled sink, None when instrumentation is disabled
+sink: Optional[Sink] = None
+
+
+def enable(new_sink: Sink):
+    """
+    Send the instrumentation events to new_sink (replaces the current one).
+    """
+    global sink
+    if not callable(new_sink):
+        raise ValueError("sink must be callable")
+    sink = new_sink
+
+
+def disable():
+    global sink
+    sink = None
+
+
+@contextmanager
+def recording(new_sink: Sink) -> Iterator[Sink]:
+    """
+    Enable new_sink within a `with` block, restoring the previous sink.
+    """
+    global sink
+    previous = sink
+    enable(new_sink)
+    try:
+        yield new_sink
+    finally:
+        sink = previous
+
+
+class Clock(object):
+    """
+    Times the stages of one call of an instrumented function.
+    """
+    __slots__ = ("operation", "_sink", "_started", "_last")
+
+    def __init__(self, operation: str, clock_sink: Sink):
+        self.operation = operation
+        self._sink = clock_sink
+        self._started = self._last = perf_counter()
+
+    def stage(self, name: str):
+        """
+        Record the time since the previous stage (or start) as stage name.
+        """
+        now = perf_counter()
+        self._sink(Event("timing", self.operation, name, now - self._last))
+        self._last = now
+
+    def size(self, name: str, value: int):
+        self._sink(Event("size", self.operation, name, value))
+
+    def done(self, **sizes: int):
+        """
+        Record the total time of the call, and the sizes of its inputs.
+        """
+        self._sink(Event("timing", self.operation, "total",
+                         perf_counter() - self._started))
+        for name, value in sizes.items():
+            self.size(name, value)
+
+
+def start(operation: str) -> Optional[Clock]:
+    """
+    Return a Clock for a call of operation, or None when disabled.
+    """
+    if sink is None:
+        return None
+    return Clock(operation, sink)
+
+
+def count(operation: str, name: str, value: int = 1):
+    """
+    Increment a counter, if enabled.
+    """
+    if sink is not None:
+        sink(Event("count", operation, name, value))
+
+
+class Stats(NamedTuple):
+    count: int
+    total: float
+    min: float
+    max: float
+
+
+class Aggregator(object):
+    """
+    In-memory sink keeping count, total, min and max of every
+    (kind, operation, name).
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str, str], Stats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        key = event[:3]
+        value = event.value
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = Stats(1, value, value, value)
+            else:
+                self._stats[key] = Stats(stats.count + 1, stats.total + value,
+                                         min(stats.min, value),
+                                         max(stats.max, value))
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], Stats]:
+        """
+        Return (kind, operation, name) -> Stats.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self, prefix: str = "unified_range") -> str:
+        """
+        Return the statistics in the Prometheus text exposition format.
+        """
+        metrics = {
+            "timing": (f"{prefix}_stage_seconds", "summary", "stage"),
+            "size": (f"{prefix}_input_size", "summary", "input"),
+            "count": (f"{prefix}_events_total", "counter", "event"),
+        }
+        snapshot = self.snapshot()
+        lines = []
+        for kind, (metric, metric_type, label) in metrics.items():
+            keys = sorted(key for key in snapshot if key[0] == kind)
+            if not keys:
+                continue
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for _, operation, name in keys:
+                stats = snapshot[kind, operation, name]
+                labels = f'{{operation="{operation}",{label}="{name}"}}'
+                # counts as integers and sums with full precision, so large
+                # totals keep changing
+                if kind == "count":
+                    lines.append(f"{metric}{labels} {int(stats.total)}")
+                else:
+                    lines.append(f"{metric}_count{labels} {stats.count}")
+                    lines.append(f"{metric}_sum{labels} {stats.total!r}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,175 @@
+"""
+Restrictions as intervals over version keys.
+
+Every restriction is mapped to a half-open interval `[start, end)` of
+positions, where a position is a tuple that orders bounds and versions:
+
+    (0,)                 - before every version (no lower bound)
+    (1, key, 0)          - just before the version with `key`
+    (1, key, 1)          - the version with `key` itself
+    (1, key, 2)          - just after the version with `key`
+    (2,)                 - after every version (no upper bound)
+
+so `[1.0,2.0)` is `[(1, key(1.0), 0), (1, key(2.0), 0))` and a version is
+included when its position falls in the interval. Intervals of many
+restrictions are sorted and merged once, and versions are then looked up
+with a binary search.
+"""
+from bisect import bisect_right
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from unified_range.comparators import VersionKey
+from unified_range.models import (Bound, Restriction, UnifiedVersionRange,
+                                  Version)
+
+BEFORE_ALL = (0,)
+AFTER_ALL = (2,)
+
+
+class KeyInterval(NamedTuple):
+    start: tuple
+    end: tuple
+    lower: Bound
+    upper: Bound
+
+
+def version_position(version_key: Any) -> tuple:
+    return 1, version_key, 1
+
+
+def restriction_interval(rst: Restriction, key: VersionKey) \
+        -> Optional[KeyInterval]:
+    """
+    Return the interval of a restriction, or None if it is empty.
+    Follows the semantics of `utils.not_included_versions`.
+    """
+    lower, upper = rst.bounds
+    if lower == upper:
+        if lower.version is None:
+            # (,) - all versions
+            return KeyInterval(BEFORE_ALL, AFTER_ALL, lower, upper)
+        # Exact version range - `[VER]`
+        exact_key = key(lower.version)
+        return KeyInterval((1, exact_key, 0), (1, exact_key, 2),
+                           Bound(lower.version, True),
+                           Bound(upper.version, True))
+    if lower.version is None and upper.version is None:
+        return None
+    start = BEFORE_ALL
+    if lower.version is not None:
+        start = (1, key(lower.version), 0 if lower.inclusive else 2)
+    end = AFTER_ALL
+    if upper.version is not None:
+        end = (1, key(upper.version), 2 if upper.inclusive else 0)
+    if not start < end:
+        return None
+    return KeyInterval(start, end, lower, upper)
+
+
+def merge_intervals(intervals: Iterable[KeyInterval]) -> List[KeyInterval]:
+    """
+    Sort and coalesce intervals, overlapping or adjacent ones are merged.
+    """
+    merged: List[KeyInterval] = []
+    for interval in sorted(intervals, key=lambda i: i.start):
+        if merged and not merged[-1].end < interval.start:
+            last = merged[-1]
+            if last.end < interval.end:
+                merged[-1] = KeyInterval(last.start, interval.end,
+                                         last.lower, interval.upper)
+        else:
+            merged.append(interval)
+    return merged
+
+
+def intersect_intervals(intervals: List[KeyInterval],
+                        others: List[KeyInterval]) -> List[KeyInterval]:
+    """
+    Intersect two lists of merged intervals, in a single sweep.
+    """
+    result: List[KeyInterval] = []
+    i = j = 0
+    while i < len(intervals) and j < len(others):
+        left, right = intervals[i], others[j]
+        lower = left if right.start < left.start else right
+        upper = left if left.end < right.end else right
+        if lower.start < upper.end:
+            result.append(KeyInterval(lower.start, upper.end,
+                                      lower.lower, upper.upper))
+        if upper is left:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def complement_intervals(intervals: List[KeyInterval]) -> List[KeyInterval]:
+    """
+    Return the gaps between merged intervals (and before/after them).
+    """
+    result: List[KeyInterval] = []
+    start, lower = BEFORE_ALL, Bound(None, False)
+    for interval in intervals:
+        if start < interval.start:
+            upper = interval.lower
+            result.append(KeyInterval(start, interval.start, lower,
+                                      Bound(upper.version, not upper.inclusive)))
+        start = interval.end
+        lower = Bound(interval.upper.version, not interval.upper.inclusive)
+    if start < AFTER_ALL:
+        result.append(KeyInterval(start, AFTER_ALL, lower, Bound(None, False)))
+    return result
+
+
+def interval_restriction(interval: KeyInterval) -> Restriction:
+    """
+    Return the restriction of an interval, unbounded sides are exclusive
+    so `(,)` is kept as the all versions restriction.
+    """
+    lower, upper = interval.lower, interval.upper
+    if interval.start == BEFORE_ALL:
+        lower = Bound(None, False)
+    if interval.end == AFTER_ALL:
+        upper = Bound(None, False)
+    return Restriction(Version(lower.version), lower.inclusive,
+                       Version(upper.version), upper.inclusive)
+
+
+def range_intervals(ranges: Iterable[UnifiedVersionRange],
+                    key: VersionKey) -> List[KeyInterval]:
+    """
+    Return the merged intervals of all the restrictions of the ranges.
+    """
+    intervals = []
+    for rng in ranges:
+        for rst in rng.constraints:
+            interval = restriction_interval(rst, key)
+            if interval is not None:
+                intervals.append(interval)
+    return merge_intervals(intervals)
+
+
+class IntervalSet(object):
+    """
+    Merged intervals with their start positions, for binary search lookups.
+    """
+    __slots__ = ("intervals", "starts")
+
+    def __init__(self, intervals: List[KeyInterval]):
+        self.intervals = intervals
+        self.starts = [interval.start for interval in intervals]
+
+    def find(self, position: tuple) -> Optional[int]:
+        """
+        Return the index of the interval containing position, or None.
+        """
+        i = bisect_right(self.starts, position) - 1
+        if i >= 0 and position < self.intervals[i].end:
+            return i
+        return None
+
+    def __contains__(self, position: tuple) -> bool:
+        return self.find(position) is not None
+
+    def __len__(self) -> int:
+        return len(self.intervals)
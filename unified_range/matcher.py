@@ -0,0 +1,114 @@
+"""
+Range sets compiled for repeated evaluation.
+
+A `RangeMatcher` parses, merges and sorts the bounds of a set of ranges
+once, so checking versions against it is a binary search. Versions are
+compared with the ecosystem ordering (see `unified_range.comparators`),
+like `UnifiedVersionRange.contains`, so they don't need to be part of a
+versions list.
+
+>>> matcher = RangeMatcher([UnifiedVersionRange.create_from_spec('[1.0,2.0)')])
+>>> matcher.matches('1.5'), matcher.next_safe('1.5', ['1.0', '1.5', '2.0'])
+(True, '2.0')
+"""
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Iterable, List, Optional, Tuple
+
+from unified_range.comparators import get_version_key
+from unified_range.intervals import IntervalSet, range_intervals, \
+    version_position
+from unified_range.models import UnifiedVersionRange
+
+
+class RangeMatcher(object):
+    """
+    Ranges compiled to merged, sorted intervals. A version "matches" when it
+    is included in any of the ranges, "safe" versions are the ones that
+    don't match.
+    """
+    __slots__ = ("ranges", "_key", "_intervals", "_versions", "_positions")
+
+    def __init__(self, ranges: Iterable[UnifiedVersionRange],
+                 versions: Optional[Iterable[str]] = None, ecosystem=None):
+        """
+        :param ranges: UnifiedVersionRange objects
+        :param versions: the package versions, in any order. Sorted once and
+            used by `next_safe` and `max_safe` when no versions are given.
+        :param ecosystem: ecosystem name or a version key callable,
+            defaults to semver.
+        """
+        self.ranges: Tuple[UnifiedVersionRange, ...] = tuple(ranges)
+        self._key = get_version_key(ecosystem)
+        self._intervals = IntervalSet(range_intervals(self.ranges, self._key))
+        self._versions: Optional[List[str]] = None
+        self._positions: Optional[list] = None
+        if versions is not None:
+            self._versions, self._positions = self._sorted(versions)
+
+    def _sorted(self, versions: Iterable[str]) -> Tuple[List[str], list]:
+        key = self._key
+        positioned = sorted(((version_position(key(v)), v) for v in versions),
+                            key=itemgetter(0))
+        return [v for _, v in positioned], [p for p, _ in positioned]
+
+    def _candidates(self, versions: Optional[Iterable[str]]) \
+            -> Tuple[List[str], list]:
+        if versions is not None:
+            return self._sorted(versions)
+        if self._versions is None:
+            raise ValueError(
+                "versions must be given when the matcher is compiled "
+                "without versions")
+        return self._versions, self._positions
+
+    def matches(self, version: str) -> bool:
+        """
+        Check if version is included in any of the ranges.
+        """
+        return version_position(self._key(version)) in self._intervals
+
+    def filter(self, versions: Iterable[str]) -> List[str]:
+        """
+        Return the versions that are not included in any of the ranges,
+        keeping their order.
+        """
+        return [v for v in versions if not self.matches(v)]
+
+    def next_safe(self, current: str,
+                  versions: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Return the lowest version, from current onwards, that is not
+        included in any of the ranges, or None.
+        :param current: version, doesn't have to be one of the versions
+        :param versions: versions to pick from, defaults to the compiled ones
+        """
+        versions, positions = self._candidates(versions)
+        intervals = self._intervals
+        i = bisect_left(positions, version_position(self._key(current)))
+        while i < len(positions):
+            found = intervals.find(positions[i])
+            if found is None:
+                return versions[i]
+            # skip the versions of the interval
+            i = bisect_left(positions, intervals.intervals[found].end, i + 1)
+        return None
+
+    def max_safe(self, versions: Optional[Iterable[str]] = None) \
+            -> Optional[str]:
+        """
+        Return the highest version that is not included in any of the
+        ranges, or None.
+        :param versions: versions to pick from, defaults to the compiled ones
+        """
+        versions, positions = self._candidates(versions)
+        intervals = self._intervals
+        i = len(positions) - 1
+        while i >= 0:
+            found = intervals.find(positions[i])
+            if found is None:
+                return versions[i]
+            # skip the versions of the interval
+            i = bisect_left(positions, intervals.intervals[found].start,
+                            0, i) - 1
+        return None
@@ -1,18 +1,53 @@
-from typing import List, Tuple, NamedTuple
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Tuple, NamedTuple
+
+from unified_range import instrumentation, speedups
+from unified_range.comparators import VersionKey, get_version_key
+from unified_range.dialects import UnifiedToken, lex_unified
 
 
 class Bound(NamedTuple):
     version: str
     inclusive: bool = False
 
+
+_tuple_new = tuple.__new__
+
+
+class _Immutable(object):
+    """
+    Base for model objects that are shared between callers (e.g. through
+    the parse cache), so attributes can only be set while constructing.
+    Subclasses declare `__slots__` and are hashable.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
 # FIXME: change implemntation of Version - str
-class Version(object):
+class Version(_Immutable):
+    __slots__ = ("version",)
+
     def __init__(self, version):
-        self.version = version
+        object.__setattr__(self, "version", version)
+
+    def __reduce__(self):
+        return Version, (self.version,)
 
     def __str__(self):
         return f"{self.version}"
 
+    def __repr__(self):
+        return f"Version({self.version!r})"
+
+    def __hash__(self):
+        return hash(self.version)
+
     def __eq__(self, other):
         if isinstance(other, Version):
             return self.version == other.version
@@ -20,7 +55,10 @@ class Version(object):
             return False
 
 
-class Restriction(object):
+class Restriction(_Immutable):
+    # only the two bounds are stored, `lower_bound`, `upper_bound` and the
+    # inclusive flags are derived from them
+    __slots__ = ("_lower", "_upper")
 
     @classmethod
     def all_versions(cls):
@@ -29,61 +67,138 @@ class Restriction(object):
     # FIXME: change constructor to use `Bound`
     def __init__(self, lower_bound: Version, has_inclusive_lower: bool,
                  upper_bound: Version, has_inclusive_upper: bool):
-        if not all((isinstance(lower_bound, Version),
-                    isinstance(upper_bound, Version))):
+        if not (isinstance(lower_bound, Version) and
+                isinstance(upper_bound, Version)):
             raise ValueError(
                 "lower_bound and upper_bound must be of type Version")
 
-        self.lower_bound = lower_bound
-        self.has_inclusive_lower = has_inclusive_lower
-        self.upper_bound = upper_bound
-        self.has_inclusive_upper = has_inclusive_upper
+        # bounds are read in the hot loops, build them once (tuple.__new__
+        # skips the python level `Bound.__new__`)
+        _set = object.__setattr__
+        _set(self, "_lower",
+             _tuple_new(Bound, (lower_bound.version, has_inclusive_lower)))
+        _set(self, "_upper",
+             _tuple_new(Bound, (upper_bound.version, has_inclusive_upper)))
+
+    @classmethod
+    def _from_bounds(cls, lower: Bound, upper: Bound) -> "Restriction":
+        """
+        Create a restriction from trusted, prebuilt bounds without
+        validating them - for decoders that share Bound objects.
+        """
+        rst = object.__new__(cls)
+        _set = object.__setattr__
+        _set(rst, "_lower", lower)
+        _set(rst, "_upper", upper)
+        return rst
+
+    def __reduce__(self):
+        lower, upper = self._lower, self._upper
+        return Restriction, (Version(lower.version), lower.inclusive,
+                             Version(upper.version), upper.inclusive)
+
+    @property
+    def lower_bound(self) -> Version:
+        """
+        A new Version of the lower bound on every access - the library's
+        own hot paths read the stored `bounds` instead.
+        """
+        return Version(self._lower.version)
+
+    @property
+    def has_inclusive_lower(self) -> bool:
+        return self._lower.inclusive
+
+    @property
+    def upper_bound(self) -> Version:
+        """
+        A new Version of the upper bound on every access, see `lower_bound`.
+        """
+        return Version(self._upper.version)
+
+    @property
+    def has_inclusive_upper(self) -> bool:
+        return self._upper.inclusive
 
     def __str__(self):
-        buffer = ['[' if self.has_inclusive_lower else '(']
-        if self.lower_bound.version:
-            buffer.append(str(self.lower_bound))
+        lower, upper = self._lower, self._upper
+        buffer = ['[' if lower.inclusive else '(']
+        if lower.version:
+            buffer.append(f"{lower.version}")
         buffer.append(',')
-        if self.upper_bound.version:
-            buffer.append(str(self.upper_bound))
-        buffer.append(']' if self.has_inclusive_upper else ')')
+        if upper.version:
+            buffer.append(f"{upper.version}")
+        buffer.append(']' if upper.inclusive else ')')
         # check if the versions are equals - [X.X.X,X.X.X] -> [X.X.X]
         if len(buffer) == 5 and buffer[1] == buffer[3]:
-            buffer = ['[', str(self.lower_bound), ']']
+            buffer = ['[', f"{lower.version}", ']']
         return "".join(buffer)
 
+    def __repr__(self):
+        return f"Restriction({str(self)!r})"
+
     def __eq__(self, other):
         if isinstance(other, Restriction):
-            lower_eq = (self.lower_bound == other.lower_bound)
-            upper_eq = (self.upper_bound == other.upper_bound)
-            inclusive_lower_eq = (
-                    self.has_inclusive_lower == other.has_inclusive_lower)
-            inclusive_upper_eq = (
-                    self.has_inclusive_upper == other.has_inclusive_upper)
-            return lower_eq and upper_eq and inclusive_lower_eq and inclusive_upper_eq
+            return self._lower == other._lower and \
+                self._upper == other._upper
         else:
             # fixme: raise exception
             return False
 
+    def __hash__(self):
+        return hash((self._lower, self._upper))
+
     @property
     def bounds(self) -> Tuple[Bound, Bound]:
-        lower = Bound(
-            version=self.lower_bound.version,
-            inclusive=self.has_inclusive_lower
-        )
-        upper = Bound(
-            version=self.upper_bound.version,
-            inclusive=self.has_inclusive_upper
-        )
         # FIXME: maybe handle equal lower/upper `[VER]`
-        return lower, upper
+        return self._lower, self._upper
 
+    def contains(self, version: str, ecosystem=None) -> bool:
+        """
+        Check if version is included in the restriction.
+        :param version: str
+        :param ecosystem: ecosystem name (see `unified_range.comparators`)
+            or a version key callable, defaults to semver.
+        :return: bool
+        """
+        key = get_version_key(ecosystem)
+        return self._contains_key(key(version), key)
+
+    def _contains_key(self, version_key: Any, key: VersionKey) -> bool:
+        # same semantics as `utils.not_included_versions`
+        lower, upper = self._lower, self._upper
+        if lower == upper:
+            if lower.version is None:
+                # (,) - all versions
+                return True
+            # Exact version range - `[VER]`
+            return version_key == key(lower.version)
+        if lower.version is None and upper.version is None:
+            return False
+        if lower.version is not None:
+            lower_key = key(lower.version)
+            if version_key < lower_key or \
+                    (not lower.inclusive and version_key == lower_key):
+                return False
+        if upper.version is not None:
+            upper_key = key(upper.version)
+            if upper_key < version_key or \
+                    (not upper.inclusive and version_key == upper_key):
+                return False
+        return True
+
+
+class UnifiedVersionRange(_Immutable):
+    __slots__ = ("recommended_version", "restrictions")
 
-class UnifiedVersionRange(object):
     # FIXME: REMOVE recommended_version feature - unused
     def __init__(self, recommended_version, restrictions):
-        self.recommended_version = recommended_version
-        self.restrictions = restrictions
+        object.__setattr__(self, "recommended_version", recommended_version)
+        object.__setattr__(self, "restrictions", tuple(restrictions))
+
+    def __reduce__(self):
+        return UnifiedVersionRange, (self.recommended_version,
+                                     self.restrictions)
 
     def __str__(self):
         if self.recommended_version is not None:
@@ -94,42 +209,143 @@ class UnifiedVersionRange(object):
                 buffer.append(str(r))
             return ",".join(buffer)
 
+    def __repr__(self):
+        return f"UnifiedVersionRange({str(self)!r})"
+
     def __eq__(self, other):
+        if not isinstance(other, UnifiedVersionRange):
+            return False
         restrictions_eq = self.restrictions == other.restrictions
         return restrictions_eq
 
+    def __hash__(self):
+        return hash(self.restrictions)
+
     @property
-    def constraints(self) -> List[Restriction]:
+    def constraints(self) -> Tuple[Restriction, ...]:
         return self.restrictions
 
+    def contains(self, version: str, ecosystem=None) -> bool:
+        """
+        Check if version is included in any of the restrictions.
+        :param version: str
+        :param ecosystem: ecosystem name (see `unified_range.comparators`)
+            or a version key callable, defaults to semver.
+        :return: bool
+        """
+        key = get_version_key(ecosystem)
+        version_key = key(version)
+        return any(rst._contains_key(version_key, key)
+                   for rst in self.restrictions)
+
+    def normalize(self, ecosystem=None) -> "UnifiedVersionRange":
+        """
+        Return the canonical form of the range - restrictions are sorted,
+        overlapping or adjacent ones are merged, restrictions that include
+        no version are dropped and ranges covering all the versions become
+        `(,)`. Equivalent ranges have equal normalized forms.
+        `[1.0,2.0),[1.5,3.0),[3.0]` -> `[1.0,3.0]`
+        A range that includes no version has no restrictions. It has no
+        range string - its str is `''`, which doesn't parse back
+        (`create_from_spec('')` returns None), use `to_bytes` to store it.
+        :param ecosystem: ecosystem name (see `unified_range.comparators`)
+            or a version key callable, defaults to semver.
+        :return: UnifiedVersionRange
+        """
+        from unified_range.intervals import range_intervals
+        if self.recommended_version is not None:
+            return self
+        key = get_version_key(ecosystem)
+        return _from_intervals(range_intervals([self], key))
+
+    def union(self, *others: "UnifiedVersionRange",
+              ecosystem=None) -> "UnifiedVersionRange":
+        """
+        Return the normalized range of versions included in any of the
+        ranges. Bounds are compared symbolically, no versions list needed.
+        :param others: UnifiedVersionRange
+        :param ecosystem: ecosystem name or a version key callable
+        :return: UnifiedVersionRange
+        """
+        from unified_range.intervals import range_intervals
+        key = get_version_key(ecosystem)
+        return _from_intervals(range_intervals((self,) + others, key))
+
+    def intersection(self, *others: "UnifiedVersionRange",
+                     ecosystem=None) -> "UnifiedVersionRange":
+        """
+        Return the normalized range of versions included in all the ranges.
+        :param others: UnifiedVersionRange
+        :param ecosystem: ecosystem name or a version key callable
+        :return: UnifiedVersionRange
+        """
+        from unified_range.intervals import intersect_intervals, range_intervals
+        key = get_version_key(ecosystem)
+        intervals = range_intervals([self], key)
+        for other in others:
+            intervals = intersect_intervals(intervals,
+                                            range_intervals([other], key))
+        return _from_intervals(intervals)
+
+    def complement(self, ecosystem=None) -> "UnifiedVersionRange":
+        """
+        Return the normalized range of versions not included in the range.
+        `[1.0,2.0)` -> `(,1.0),[2.0,)`
+        :param ecosystem: ecosystem name or a version key callable
+        :return: UnifiedVersionRange
+        """
+        from unified_range.intervals import (complement_intervals,
+                                             range_intervals)
+        key = get_version_key(ecosystem)
+        return _from_intervals(complement_intervals(range_intervals([self], key)))
+
+    def difference(self, *others: "UnifiedVersionRange",
+                   ecosystem=None) -> "UnifiedVersionRange":
+        """
+        Return the normalized range of versions included in the range but
+        in none of the others.
+        :param others: UnifiedVersionRange
+        :param ecosystem: ecosystem name or a version key callable
+        :return: UnifiedVersionRange
+        """
+        from unified_range.intervals import (complement_intervals,
+                                             intersect_intervals,
+                                             range_intervals)
+        key = get_version_key(ecosystem)
+        return _from_intervals(intersect_intervals(
+            range_intervals([self], key),
+            complement_intervals(range_intervals(others, key))))
+
     @staticmethod
     def parse_restriction(spec):
-        has_inclusive_lower = spec.startswith("[")
-        has_inclusive_upper = spec.endswith("]")
-        process = spec[1:-1].strip()
-        index = process.find(',')
+        return UnifiedVersionRange._restriction_from_parts(
+            spec, spec.startswith("["), spec[1:-1], spec.endswith("]"))
+
+    @staticmethod
+    def _restriction_from_parts(spec, has_inclusive_lower, process,
+                                has_inclusive_upper):
+        """
+        Create Restriction from the brackets and the text between them.
+        """
+        lower_bound, comma, upper_bound = process.partition(',')
         # [X.X.X]
-        if index < 0:
+        if not comma:
             if not has_inclusive_lower or not has_inclusive_upper:
                 raise ValueError(
                     "Single version must be surrounded by []: {}".format(spec))
-            version = Version(process)
+            version = Version(process.strip())
             restriction = Restriction(version, has_inclusive_lower, version,
                                       has_inclusive_upper)
         else:
-            lower_bound = process[0: index].strip()
-            upper_bound = process[index + 1:].strip()
+            lower_bound = lower_bound.strip()
+            upper_bound = upper_bound.strip()
             if lower_bound == '' and upper_bound == '':
                 return Restriction.all_versions()
             if lower_bound == upper_bound:
                 raise ValueError(
                     "Range cannot have identical boundaries: {}".format(spec))
-            lower_version = Version(None)
-            if len(lower_bound) > 0:
-                lower_version = Version(lower_bound)
-            upper_version = Version(None)
-            if len(upper_bound) > 0:
-                upper_version = Version(upper_bound)
+            lower_version = Version(lower_bound or None)
+            upper_version = Version(upper_bound or None)
             restriction = Restriction(lower_version, has_inclusive_lower,
                                       upper_version, has_inclusive_upper)
         return restriction
@@ -138,12 +354,11 @@ class UnifiedVersionRange(object):
     def create_from_spec(spec: str):
         """
         Create unifiedVersionRange from maven spec string - `[x,y]`
+        The spec is tokenized in a single pass (see `dialects.lex_unified`),
+        errors report the position (in spec) of the restriction that failed.
         :param spec:
         :return:
         """
-        restrictions = []
-        process = spec.strip()
-        version = None
         if not spec:
             return
         if not isinstance(spec, str):
@@ -153,38 +368,49 @@ class UnifiedVersionRange(object):
                     type(spec)
                 )
             )
+        clock = instrumentation.start("create_from_spec")
+        rng = UnifiedVersionRange._from_tokens(lex_unified(spec))
+        if clock is not None:
+            clock.done(restrictions=len(rng.restrictions))
+        return rng
 
-        if not process.startswith(("(", "[")) and not process.endswith(
-                (")", "]")):
-            raise ValueError("Recommended Version is currently not supported.")
-        while process.startswith("[") or process.startswith("("):
-            index1 = process.find(")")
-            index2 = process.find("]")
-            index = index2
-            if index2 < 0 or index1 < index2:
-                if index1 >= 0:
-                    index = index1
-            if index < 0:
-                raise ValueError("Unbounded range: {}".format(spec))
-
-            restriction = UnifiedVersionRange.parse_restriction(
-                process[0:index + 1])
-            restrictions.append(restriction)
-            process = process[index + 1:].strip()
-            if len(process) > 0 and process.startswith(","):
-                process = process[1:].strip()
-        if len(process) > 0:
-            if len(restrictions) > 0:
-                raise ValueError(
-                    "Only fully-qualified sets allowed in multiple set scenario: {}".format(
-                        spec))
-            else:
+    @staticmethod
+    def _from_tokens(tokens: Iterable[UnifiedToken]) -> "UnifiedVersionRange":
+        """
+        Create unifiedVersionRange from the tokens of `dialects.lex_unified`.
+        """
+        restrictions = []
+        version = None
+        for text, has_inclusive_lower, process, has_inclusive_upper in tokens:
+            if text is None:
                 # fixme: use strings instead Version
                 version = Version(process)
                 restrictions.append(Restriction.all_versions())
-
+            else:
+                restrictions.append(
+                    UnifiedVersionRange._restriction_from_parts(
+                        text, has_inclusive_lower, process,
+                        has_inclusive_upper))
         return UnifiedVersionRange(version, restrictions)
 
+    def to_bytes(self) -> bytes:
+        """
+        Return the compact binary encoding of the range
+        (see `unified_range.serialization`).
+        """
+        from unified_range.serialization import to_bytes
+        return to_bytes(self)
+
+    @staticmethod
+    def from_bytes(data) -> "UnifiedVersionRange":
+        """
+        Decode a range encoded with `to_bytes`.
+        :param data: bytes-like object
+        :return: UnifiedVersionRange
+        """
+        from unified_range.serialization import from_bytes
+        return from_bytes(data)
+
     # FIXME: Remove not needed
     @staticmethod
     def create_from_version(version):
@@ -194,3 +420,71 @@ class UnifiedVersionRange(object):
                 "Only Strings allowed.\ninput version:{}\ntype: {}".format(
                     version, type(version)))
         return UnifiedVersionRange(Version(version), restrictions)
+
+
+def _from_intervals(intervals) -> UnifiedVersionRange:
+    # intervals are built on top of the models, import them lazily
+    from unified_range.intervals import interval_restriction
+    return UnifiedVersionRange(
+        None, [interval_restriction(interval) for interval in intervals])
+
+
+def _version_positions(versions: List[str]) -> Dict[str, int]:
+    positions: Dict[str, int] = {}
+    for i, version in enumerate(versions):
+        # only first one that found, same as `list.index`
+        positions.setdefault(version, i)
+    return positions
+
+
+_version_positions = speedups.kernel("version_positions", _version_positions)
+
+
+class VersionIndex(Sequence):
+    """
+    Ascending versions list with a precomputed version -> position map.
+    Build it once per package and pass it to the filtering functions instead
+    of the raw list, so lookups of range bounds don't scan the list.
+    """
+
+    def __init__(self, asc_versions: Iterable[str]):
+        self.versions: List[str] = list(asc_versions)
+        self._positions = _version_positions(self.versions)
+
+    @classmethod
+    def of(cls, asc_versions) -> "VersionIndex":
+        """
+        Return asc_versions as VersionIndex, building one only if needed.
+        """
+        if isinstance(asc_versions, cls):
+            return asc_versions
+        return cls(asc_versions)
+
+    def position(self, version: str) -> Optional[int]:
+        """
+        Return the position of version, or None if it isn't in the index.
+        """
+        return self._positions.get(version)
+
+    def index(self, version, *args) -> int:
+        if args:
+            return self.versions.index(version, *args)
+        ret = self._positions.get(version)
+        if ret is None:
+            raise ValueError(f"{version!r} is not in list")
+        return ret
+
+    def __contains__(self, version) -> bool:
+        return version in self._positions
+
+    def __getitem__(self, item):
+        return self.versions[item]
+
+    def __iter__(self):
+        return iter(self.versions)
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def __str__(self):
+        return str(self.versions)
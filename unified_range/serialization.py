@@ -0,0 +1,214 @@
+"""
+Compact, versioned binary encoding of parsed ranges.
+
+Loading stored ranges with `from_bytes`/`loads` skips parsing the unified
+strings. A list of ranges is encoded with one string table for all of
+their bound versions:
+
+    magic b"UR" | format version (1 byte) | varint versions count |
+    varint table size | table: utf-8 versions separated by NUL bytes |
+    varint ranges count | ranges
+
+and every range is:
+
+    varint restrictions count | varint recommended version (0 for none,
+    otherwise table index + 1) | flags, 4 bits per restriction (lower set,
+    lower inclusive, upper set, upper inclusive), two per byte |
+    varint table index of every set bound
+
+A single range (`to_bytes`) is a list of one range.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from unified_range.models import (Bound, Restriction, UnifiedVersionRange,
+                                  Version)
+
+MAGIC = b"UR"
+FORMAT_VERSION = 1
+
+_LOWER = 1
+_LOWER_INCLUSIVE = 2
+_UPPER = 4
+_UPPER_INCLUSIVE = 8
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos: int) -> Tuple[int, int]:
+    """
+    Return the varint at pos and the position after it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _string_index(strings: Dict[str, int], version: str) -> int:
+    index = strings.get(version)
+    if index is None:
+        if "\0" in version:
+            raise ValueError(f"Version can't contain NUL bytes: {version!r}")
+        index = strings[version] = len(strings)
+    return index
+
+
+def dumps(ranges: Iterable[UnifiedVersionRange]) -> bytes:
+    """
+    Encode a list of ranges, bound versions are stored once.
+    :param ranges: UnifiedVersionRange objects
+    :return: bytes
+    """
+    strings: Dict[str, int] = {}
+    body = bytearray()
+    count = 0
+    for rng in ranges:
+        count += 1
+        restrictions = rng.restrictions
+        _write_varint(body, len(restrictions))
+        recommended = rng.recommended_version
+        if recommended is None or recommended.version is None:
+            body.append(0)
+        else:
+            _write_varint(body, _string_index(
+                strings, recommended.version) + 1)
+        flags = bytearray((len(restrictions) + 1) // 2)
+        indices = bytearray()
+        for i, rst in enumerate(restrictions):
+            lower, upper = rst.bounds
+            nibble = 0
+            if lower.version is not None:
+                nibble |= _LOWER
+                _write_varint(indices, _string_index(strings, lower.version))
+            if lower.inclusive:
+                nibble |= _LOWER_INCLUSIVE
+            if upper.version is not None:
+                nibble |= _UPPER
+                _write_varint(indices, _string_index(strings, upper.version))
+            if upper.inclusive:
+                nibble |= _UPPER_INCLUSIVE
+            flags[i >> 1] |= nibble << ((i & 1) * 4)
+        body += flags
+        body += indices
+
+    table = "\0".join(strings).encode("utf-8")
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    _write_varint(out, len(strings))
+    _write_varint(out, len(table))
+    out += table
+    _write_varint(out, count)
+    out += body
+    return bytes(out)
+
+
+def loads(data) -> List[UnifiedVersionRange]:
+    """
+    Decode ranges encoded with `dumps`.
+    :param data: bytes-like object (bytes, memoryview, mmap slice)
+    :return: list of UnifiedVersionRange
+    """
+    if bytes(data[:2]) != MAGIC:
+        raise ValueError("Not an encoded unified range")
+    if data[2] != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported unified range encoding version: {data[2]}")
+    try:
+        return _loads(data)
+    except IndexError:
+        raise ValueError("Truncated unified range encoding")
+
+
+def _loads(data) -> List[UnifiedVersionRange]:
+    strings_count, pos = _read_varint(data, 3)
+    table_size, pos = _read_varint(data, pos)
+    table = bytes(data[pos:pos + table_size])
+    if len(table) != table_size:
+        raise IndexError
+    pos += table_size
+    # bounds of the same version share (immutable) Bound objects
+    versions = table.decode("utf-8").split("\0") if strings_count else []
+    if len(versions) != strings_count:
+        raise ValueError("Corrupted unified range string table")
+    # (table index, inclusive) -> Bound, -1 for no version
+    bounds: Dict[Tuple[int, bool], Bound] = {
+        (-1, False): Bound(None, False),
+        (-1, True): Bound(None, True),
+    }
+    # identical restrictions share one (immutable) Restriction object
+    decoded: Dict[Tuple[int, int, int], Restriction] = {}
+    from_bounds = Restriction._from_bounds
+    count, pos = _read_varint(data, pos)
+    ranges = []
+    for _ in range(count):
+        restrictions_count = data[pos]
+        if restrictions_count < 0x80:
+            pos += 1
+        else:
+            restrictions_count, pos = _read_varint(data, pos)
+        recommended, pos = _read_varint(data, pos)
+        flags_end = pos + (restrictions_count + 1) // 2
+        flags = data[pos:flags_end]
+        pos = flags_end
+        restrictions = []
+        for i in range(restrictions_count):
+            nibble = (flags[i >> 1] >> ((i & 1) * 4)) & 0xF
+            lower = upper = -1
+            if nibble & _LOWER:
+                lower = data[pos]
+                if lower < 0x80:
+                    pos += 1
+                else:
+                    lower, pos = _read_varint(data, pos)
+            if nibble & _UPPER:
+                upper = data[pos]
+                if upper < 0x80:
+                    pos += 1
+                else:
+                    upper, pos = _read_varint(data, pos)
+            key = (nibble, lower, upper)
+            rst = decoded.get(key)
+            if rst is None:
+                lower_key = (lower, nibble & _LOWER_INCLUSIVE != 0)
+                upper_key = (upper, nibble & _UPPER_INCLUSIVE != 0)
+                if lower_key not in bounds:
+                    bounds[lower_key] = Bound(versions[lower],
+                                              lower_key[1])
+                if upper_key not in bounds:
+                    bounds[upper_key] = Bound(versions[upper],
+                                              upper_key[1])
+                rst = decoded[key] = from_bounds(bounds[lower_key],
+                                                 bounds[upper_key])
+            restrictions.append(rst)
+        ranges.append(UnifiedVersionRange(
+            Version(versions[recommended - 1]) if recommended else None,
+            restrictions))
+    return ranges
+
+
+def to_bytes(rng: UnifiedVersionRange) -> bytes:
+    """
+    Encode a single range.
+    """
+    return dumps([rng])
+
+
+def from_bytes(data) -> UnifiedVersionRange:
+    """
+    Decode a single range encoded with `to_bytes`.
+    """
+    ranges = loads(data)
+    if len(ranges) != 1:
+        raise ValueError(
+            f"Expected a single encoded range, found {len(ranges)}")
+    return ranges[0]
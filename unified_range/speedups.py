@@ -0,0 +1,49 @@
+"""
+Optional compiled kernels.
+
+`unified_range_speedups` is a Cython build of the parse and filter
+kernels - the maven and semver lexers (`dialects.lex_unified`,
+`dialects.lex_semver`), the versions index (`VersionIndex`) and the index
+intervals of `utils.not_included_versions` and friends. It is its own
+distribution (`unified-range-speedups`, see `speedups/setup.py`) so the
+package stays pure python. The compiled kernels are used when it is
+installed and the pure python kernels otherwise. Both behave the same.
+
+Set the UNIFIED_RANGE_PURE_PYTHON environment variable (to anything but
+`0`) before importing `unified_range` to use the pure python kernels even
+if the compiled ones are built.
+"""
+import os
+from typing import Callable, Dict
+
+PURE_PYTHON_ENV = "UNIFIED_RANGE_PURE_PYTHON"
+
+
+def _load_compiled():
+    if os.environ.get(PURE_PYTHON_ENV, "0") != "0":
+        return None
+    try:
+        import unified_range_speedups as _speedups
+    except ImportError:
+        return None
+    return _speedups
+
+
+_speedups = _load_compiled()
+
+# True when the compiled kernels are used
+ENABLED = _speedups is not None
+
+# the pure python kernels, by name
+PURE_KERNELS: Dict[str, Callable] = {}
+
+
+def kernel(name: str, pure: Callable) -> Callable:
+    """
+    Return the compiled kernel `name`, or the pure python implementation
+    if the kernels aren't installed (or are disabled).
+    """
+    PURE_KERNELS[name] = pure
+    if _speedups is None:
+        return pure
+    return getattr(_speedups, name)
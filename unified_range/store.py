@@ -0,0 +1,215 @@
+"""
+Read-only, memory-mapped store of parsed ranges by package.
+
+`build` parses the (semver or unified) ranges of every package once and
+writes them to a file; `RangeStore` maps the file read-only, so processes
+opening the same file share its pages instead of each holding all the
+parsed ranges. A package's ranges are decoded when the package is first
+queried, and kept in a bounded LRU cache.
+
+    store.build("advisories.urdb", {"npm:lodash": ["<4.17.21"], ...})
+    with store.RangeStore("advisories.urdb") as ranges:
+        ranges.filter_versions("npm:lodash", asc_versions)
+
+File layout (integers are little endian):
+
+    magic b"URDB" | format version (1 byte) | 3 padding bytes |
+    u64 packages count | u64 index offset |
+    records: the ranges of every package, encoded with `serialization.dumps` |
+    keys: utf-8 package keys |
+    index: one entry per package, sorted by key -
+        u64 key offset | u32 key size | u64 record offset | u32 record size
+"""
+import mmap
+import os
+import secrets
+import struct
+from typing import (BinaryIO, Iterable, Iterator, List, Mapping, Optional,
+                    Tuple, Union)
+
+from unified_range import api, serialization, utils
+from unified_range.cache import DEFAULT_MAXSIZE, ParseCache
+from unified_range.models import UnifiedVersionRange, VersionIndex
+
+MAGIC = b"URDB"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sB3xQQ")
+_ENTRY = struct.Struct("<QIQI")
+
+
+def build(path: str, ranges_by_package: Mapping[str, Iterable[str]]):
+    """
+    Parse the ranges of every package and write them to a store file.
+    The file is written to a temporary file next to path and moved into
+    place, so processes that mapped a previous version keep reading it.
+    :param path: file path
+    :param ranges_by_package: package key -> semver or unified ranges
+    """
+    # a unique temporary file, so concurrent builds don't clobber each other.
+    # Unlike `tempfile.mkstemp` (0600) it is created with the umask's
+    # permissions, so processes of other users can map the store.
+    tmp_path = f"{path}.{secrets.token_hex(8)}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL |
+                 getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as store_file:
+            _write(store_file, ranges_by_package)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write(store_file: BinaryIO,
+           ranges_by_package: Mapping[str, Iterable[str]]):
+    packages = sorted((package.encode("utf-8"), package)
+                      for package in ranges_by_package)
+    store_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+    offset = _HEADER.size
+    records: List[Tuple[int, int]] = []
+    for _, package in packages:
+        record = serialization.dumps(
+            [api._parse_range(rng) for rng in ranges_by_package[package]])
+        store_file.write(record)
+        records.append((offset, len(record)))
+        offset += len(record)
+    keys: List[Tuple[int, int]] = []
+    for key, _ in packages:
+        store_file.write(key)
+        keys.append((offset, len(key)))
+        offset += len(key)
+    for (key_offset, key_size), (record_offset, record_size) in \
+            zip(keys, records):
+        store_file.write(_ENTRY.pack(key_offset, key_size,
+                                     record_offset, record_size))
+    # the index follows the keys
+    store_file.seek(0)
+    store_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(packages),
+                                  offset))
+
+
+class RangeStore(object):
+    """
+    Read-only view of a store file written by `build`.
+    Packages missing from the store have no ranges.
+    """
+
+    def __init__(self, path: str, cache_size: int = DEFAULT_MAXSIZE):
+        """
+        :param path: file path
+        :param cache_size: number of decoded packages to keep
+        """
+        with open(path, "rb") as store_file:
+            self._mmap = mmap.mmap(store_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise ValueError(f"Not a unified range store: {path}")
+            magic, version, self._count, self._index_offset = \
+                _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"Not a unified range store: {path}")
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported unified range store version: {version}")
+            if self._index_offset + self._count * _ENTRY.size > \
+                    len(self._mmap):
+                raise ValueError(f"Truncated unified range store: {path}")
+        except ValueError:
+            self._mmap.close()
+            raise
+        self._cache = ParseCache(self._decode, cache_size, name="range_store")
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self) -> "RangeStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, position: int) -> Tuple[bytes, int, int]:
+        key_offset, key_size, record_offset, record_size = _ENTRY.unpack_from(
+            self._mmap, self._index_offset + position * _ENTRY.size)
+        return (self._mmap[key_offset:key_offset + key_size],
+                record_offset, record_size)
+
+    def _find(self, package: str) -> Optional[Tuple[int, int]]:
+        """
+        Binary search the index, return the record offset and size.
+        """
+        key = package.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, record_offset, record_size = self._entry(middle)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return record_offset, record_size
+        return None
+
+    def __contains__(self, package) -> bool:
+        return isinstance(package, str) and self._find(package) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate the package keys, in (utf-8) sorted order.
+        """
+        for position in range(self._count):
+            yield self._entry(position)[0].decode("utf-8")
+
+    def _decode(self, package: str) -> List[UnifiedVersionRange]:
+        found = self._find(package)
+        if found is None:
+            return []
+        record_offset, record_size = found
+        return serialization.loads(
+            self._mmap[record_offset:record_offset + record_size])
+
+    def ranges(self, package: str) -> List[UnifiedVersionRange]:
+        """
+        Return the parsed ranges of a package.
+        """
+        # a copy, cached lists are shared
+        return list(self._cache(package))
+
+    def filter_versions(self, package: str,
+                        asc_versions: Union[List[str], VersionIndex]) \
+            -> List[str]:
+        """
+        `api.filter_versions` with the package's ranges.
+        """
+        return utils.not_included_versions(asc_versions,
+                                           self._cache(package))
+
+    def next_filtered_version(self, package: str, current_version: str,
+                              asc_versions: Union[List[str],
+                                                  VersionIndex]) \
+            -> Optional[str]:
+        """
+        `api.next_filtered_version` with the package's ranges.
+        """
+        version_index = VersionIndex.of(asc_versions)
+        if current_version not in version_index:
+            raise ValueError(
+                'current_version given is not part of asc_version')
+        return utils.next_not_included_version(
+            version_index, self._cache(package), current_version)
+
+    def maximum_filtered_version(self, package: str,
+                                 asc_versions: Union[List[str],
+                                                     VersionIndex]) \
+            -> Optional[str]:
+        """
+        `api.maximum_filtered_version` with the package's ranges.
+        """
+        return utils.last_not_included_version(asc_versions,
+                                               self._cache(package))
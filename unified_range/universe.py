@@ -0,0 +1,87 @@
+"""
+Sorted version lists ("universes") for the filtering functions.
+
+The `api` filtering functions take the versions of a package in ascending
+order. `build_universe` sorts versions in any order with an ecosystem's
+version key (see `unified_range.comparators`), computing the key of every
+version once, and returns a `VersionUniverse` - a `VersionIndex`, so it can
+be passed as `asc_versions` to any number of `api.filter_versions`,
+`api.next_filtered_version` or `api.maximum_filtered_version` calls.
+Universes are cached by their set of versions and ecosystem, cached
+universes are shared and must not be modified.
+
+    universe = api.version_universe(versions, "maven", ranges)
+    api.filter_versions(universe, ranges)
+"""
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List
+
+from unified_range.comparators import VersionKey, get_version_key
+from unified_range.models import UnifiedVersionRange, VersionIndex
+
+UNIVERSE_CACHE_SIZE = 256
+
+
+class VersionUniverse(VersionIndex):
+    """
+    Distinct versions sorted in ascending ecosystem order. Versions with
+    equal keys (e.g. `1.0` and `1.0.0`) are ordered by their string.
+    """
+
+    def __init__(self, versions: Iterable[str], ecosystem=None):
+        """
+        :param versions: versions, in any order
+        :param ecosystem: ecosystem name or version key callable,
+            defaults to semver
+        """
+        key: VersionKey = get_version_key(ecosystem)
+        distinct = set(versions)
+        super().__init__(version for _, version in
+                         sorted(zip(map(key, distinct), distinct)))
+        self.ecosystem = ecosystem
+
+    def missing_bounds(self, ranges: Iterable[UnifiedVersionRange]) \
+            -> List[str]:
+        """
+        Return the range bound versions that aren't in the universe.
+        """
+        missing = {}
+        for rng in ranges:
+            for rst in rng.restrictions:
+                for bound in rst.bounds:
+                    if bound.version is not None and \
+                            bound.version not in self:
+                        missing[bound.version] = None
+        return list(missing)
+
+    def validate(self, ranges: Iterable[UnifiedVersionRange]):
+        """
+        Raise ValueError if range bound versions aren't in the universe,
+        the filtering functions require all of them.
+        """
+        missing = self.missing_bounds(ranges)
+        if missing:
+            raise ValueError(
+                f"Range bounds {missing} couldn't be found in the versions "
+                f"list")
+
+
+@lru_cache(maxsize=UNIVERSE_CACHE_SIZE)
+def _cached_universe(versions: FrozenSet[str], ecosystem) -> VersionUniverse:
+    return VersionUniverse(versions, ecosystem)
+
+
+def build_universe(versions: Iterable[str], ecosystem=None) \
+        -> VersionUniverse:
+    """
+    Return the (cached) universe of versions.
+    :param versions: versions, in any order
+    :param ecosystem: ecosystem name or version key callable,
+        defaults to semver
+    :return: VersionUniverse
+    """
+    return _cached_universe(frozenset(versions), ecosystem)
+
+
+def clear_cache():
+    _cached_universe.cache_clear()
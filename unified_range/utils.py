@@ -1,48 +1,35 @@
 import re
-from typing import List, Optional
-
-from unified_range.models import UnifiedVersionRange, Restriction, Version
-
-semver_operators = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">=", "eq": "="}
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # numpy is optional
+    numpy = None
+
+from unified_range import instrumentation, speedups
+from unified_range.dialects import (EXACT, MAVEN, Comparators, classify,
+                                    lex_semver, operator_families)
+from unified_range.models import (UnifiedVersionRange, Restriction, Version,
+                                  VersionIndex)
+
+semver_operators = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">=", "eq": "=",
+                    "caret": "^", "tilde": "~"}
 unified_operators = {"lt": ")", "lte": "]", "gt": "(", "gte": "["}
 
-
-def _is_unified_ops(rng):
-    return any(op in rng for op in unified_operators.values())
-
-
-def _is_semver_ops(rng):
-    return any(op in rng for op in semver_operators.values())
-
-
-def _clean_semver(semver):
-    # also cleaning `v=X.X.X` `= X.X.X`
-    # TODO: regex catching invalid semvers `<=v1.2.3` => `<1.2.3'
-    remove_eq = re.sub(r'(?<![<>])=?v?(?=.*?)', '', semver.strip())
-    remove_eq_v = re.sub(r'(?<=[<>])v?(?=.*?)', '', remove_eq)
-    return remove_eq_v
-
-
-def _comparator_trim(semver: str) -> str:
-    """
-    clean spaces between operator to the version.
-    `> 1.2.3 <= 1.2.5` => `>1.2.3 <=1.2.5`
-    :param semver:
-    :return:
-    """
-    # switch `,` to ` ` for composer versions
-    if ',' in semver:
-        semver = semver.replace(',', ' ')
-    COMPARTOR_TRIM = r'\s+(?=[^<>|])'
-    return re.sub(COMPARTOR_TRIM, '', semver.strip())
+# below this many restrictions sorting and slicing in pure python is faster
+# than building the numpy arrays.
+NUMPY_MIN_INTERVALS = 1000
 
 
 def is_semver_range(rng):
-    return _is_semver_ops(rng) and not _is_unified_ops(rng)
+    has_semver, has_unified = operator_families(rng)
+    return has_semver and not has_unified
 
 
 def is_unified_range(rng):
-    return _is_unified_ops(rng) and not _is_semver_ops(rng)
+    has_semver, has_unified = operator_families(rng)
+    return has_unified and not has_semver
 
 
 def transform_to_semver(unified_spec: str, separator: str) -> str:
@@ -63,11 +50,16 @@ def transform_to_semver(unified_spec: str, separator: str) -> str:
     # FIXME: use semver_operators and _is_semver_{ops,range}
     operators = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
 
-    if is_semver_range(unified_spec):
-        raise ValueError(
-            "Version ranges seems to already be semver")
+    try:
+        unified_version = UnifiedVersionRange.create_from_spec(unified_spec)
+    except ValueError:
+        # semver ranges have no brackets, so only check the operators
+        # of the specs that failed to lex
+        if isinstance(unified_spec, str) and is_semver_range(unified_spec):
+            raise ValueError(
+                "Version ranges seems to already be semver") from None
+        raise
     contains_all_version = UnifiedVersionRange(None, [Restriction.all_versions()])
-    unified_version = UnifiedVersionRange.create_from_spec(unified_spec)
     if unified_version == contains_all_version:
         return "*"
 
@@ -75,43 +67,178 @@ def transform_to_semver(unified_spec: str, separator: str) -> str:
     semvers = []
 
     for restriction in unified_restrictions:
-        if restriction.upper_bound.version and restriction.lower_bound.version:
+        lower, upper = restriction.bounds
+        if upper.version and lower.version:
             # specific version
-            if restriction.lower_bound.version == restriction.upper_bound.version:
-                semvers.append("{}".format(restriction.upper_bound))
+            if lower.version == upper.version:
+                semvers.append("{}".format(upper.version))
             # two constraints semver `>1.1.2 <=2.0.0`
             # `{operator}{version} {operator}{version}`
             else:
                 gt_gte = operators["gt"]
-                if restriction.has_inclusive_lower:
+                if lower.inclusive:
                     gt_gte = operators["gte"]
                 lt_lte = operators["lt"]
-                if restriction.has_inclusive_upper:
+                if upper.inclusive:
                     lt_lte = operators["lte"]
                 semvers.append(
-                    "{}{}{}{}{}".format(gt_gte, restriction.lower_bound,
+                    "{}{}{}{}{}".format(gt_gte, lower.version,
                                         separator,
-                                        lt_lte, restriction.upper_bound))
+                                        lt_lte, upper.version))
         # one constraint semver `>=1.2.3`
         # {operator}{version}
         else:
-            if restriction.upper_bound.version and not restriction.lower_bound.version:
+            if upper.version and not lower.version:
                 lt_lte = operators["lt"]
-                if restriction.has_inclusive_upper:
+                if upper.inclusive:
                     lt_lte = operators["lte"]
                 semvers.append(
-                    "{}{}".format(lt_lte, restriction.upper_bound))
-            elif restriction.lower_bound.version and not restriction.upper_bound.version:
+                    "{}{}".format(lt_lte, upper.version))
+            elif lower.version and not upper.version:
                 gt_gte = operators["gt"]
-                if restriction.has_inclusive_lower:
+                if lower.inclusive:
                     gt_gte = operators["gte"]
                 semvers.append(
-                    "{}{}".format(gt_gte, restriction.lower_bound))
+                    "{}{}".format(gt_gte, lower.version))
             else:
                 raise ValueError("lower and upper bound are None")
     return " || ".join(semvers)
 
 
+_PARTIAL_VERSION_RE = re.compile(
+    r"(\d+|[xX*])(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?(.*)")
+_WILDCARD_VERSION_RE = re.compile(r"(?:\d+\.){0,2}[xX*](?:\.[xX*]){0,2}")
+_NUMERIC_SEGMENTS_RE = re.compile(r"\d+(?:\.\d+)*")
+
+# a bound of a comparator: (version or None for unbounded, inclusive)
+_SemverBound = Tuple[Optional[str], bool]
+
+
+def _partial_version(version: str) -> Optional[Tuple[Optional[str], ...]]:
+    """
+    Split `1.2.x` like versions to (major, minor, patch, rest). Missing and
+    wildcard (x, X, *) parts, and all the parts after them, are None.
+    Return None if version doesn't start with a number or a wildcard, or
+    has a wildcard followed by more text.
+    """
+    match = _PARTIAL_VERSION_RE.fullmatch(version)
+    if match is None:
+        return None
+    parts = list(match.groups())
+    for i in range(3):
+        if parts[i] is not None and parts[i] in "xX*":
+            if parts[3]:
+                return None
+            parts[i:3] = [None] * (3 - i)
+            break
+    return tuple(parts)
+
+
+def _xrange(partial) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the inclusive lower and exclusive upper versions of a partial
+    version - `1.2.x` is `>=1.2.0 <1.3.0`. None means unbounded.
+    """
+    major, minor, patch, _ = partial
+    if major is None:
+        return None, None
+    if minor is None:
+        return f"{major}.0.0", f"{int(major) + 1}.0.0"
+    return f"{major}.{minor}.0", f"{major}.{int(minor) + 1}.0"
+
+
+def _inclusive(version: Optional[str]) -> _SemverBound:
+    return version, version is not None
+
+
+def _exclusive(version: Optional[str]) -> _SemverBound:
+    return version, False
+
+
+def _comparator_bounds(op: Optional[str], version: str) \
+        -> Tuple[Optional[_SemverBound], Optional[_SemverBound]]:
+    """
+    Return the (lower, upper) bounds a comparator sets, None for a bound
+    that is left unchanged.
+    """
+    wildcard = ("x" in version or "X" in version or "*" in version) and \
+        _WILDCARD_VERSION_RE.fullmatch(version) is not None
+    if op in (None, "="):
+        if wildcard:
+            lower, upper = _xrange(_partial_version(version))
+            return _inclusive(lower), _exclusive(upper)
+        return (version, True), (version, True)
+    if op in (">=", ">", "<=", "<"):
+        if not wildcard:
+            if op[0] == ">":
+                return (version, op == ">="), None
+            return None, (version, op == "<=")
+        lower, upper = _xrange(_partial_version(version))
+        if op == ">=":
+            return _inclusive(lower), None
+        if op == "<=":
+            return None, _exclusive(upper)
+        if lower is None:
+            # `>*` and `<*` - no version
+            return None, ("0.0.0", False)
+        if op == ">":
+            return (upper, True), None
+        return None, (lower, False)
+    partial = _partial_version(version)
+    if partial is None:
+        raise ValueError(f"Invalid version for {op} range: {version}")
+    if op == "~>" and wildcard:
+        # the pessimistic operator bumps the last segment, not a wildcard
+        raise ValueError(f"Invalid version for {op} range: {version}")
+    major, minor, patch, _ = partial
+    if major is None:
+        return (None, False), (None, False)
+    if op == "~>":
+        # ruby's pessimistic operator, drop the last segment and bump
+        segments = _NUMERIC_SEGMENTS_RE.match(version).group().split(".")
+        if len(segments) > 1:
+            segments.pop()
+        segments[-1] = str(int(segments[-1]) + 1)
+        return (version, True), (".".join(segments), False)
+    if minor is None or patch is None:
+        lower, upper = _xrange(partial)
+        if op == "^" and minor is not None and major == "0":
+            # ^0.2.x := >=0.2.0 <0.3.0
+            return _inclusive(lower), _exclusive(upper)
+        if op == "^" and minor is not None:
+            upper = f"{int(major) + 1}.0.0"
+        return _inclusive(lower), _exclusive(upper)
+    if op == "~":
+        return (version, True), (f"{major}.{int(minor) + 1}.0", False)
+    # op == "^", bump the first non zero part
+    if major != "0":
+        upper = f"{int(major) + 1}.0.0"
+    elif minor != "0":
+        upper = f"0.{int(minor) + 1}.0"
+    else:
+        upper = f"0.0.{int(patch) + 1}"
+    return (version, True), (upper, False)
+
+
+def _hyphen_bounds(lower: str, upper: str) \
+        -> Tuple[_SemverBound, _SemverBound]:
+    """
+    Bounds of a hyphen range `1.2.3 - 2.3.4` := `>=1.2.3 <=2.3.4`, partial
+    versions are x-ranges - `1.2 - 2.3` := `>=1.2.0 <2.4.0`.
+    """
+    lower_partial = _partial_version(lower)
+    if lower_partial is not None and lower_partial[2] is None:
+        lower_bound = _inclusive(_xrange(lower_partial)[0])
+    else:
+        lower_bound = (lower, True)
+    upper_partial = _partial_version(upper)
+    if upper_partial is not None and upper_partial[2] is None:
+        upper_bound = _exclusive(_xrange(upper_partial)[1])
+    else:
+        upper_bound = (upper, True)
+    return lower_bound, upper_bound
+
+
 def create_from_semver(semver: str) -> UnifiedVersionRange:
     """
     Transform semver range string (following npm/node spec,
@@ -121,96 +248,127 @@ def create_from_semver(semver: str) -> UnifiedVersionRange:
     https://maven.apache.org/enforcer/enforcer-rules/versionRanges.html).
 
     >1.2.3 <=2.4.6 ----> (1.2.3, 2.4.6]
+    ^1.2.3 ----> [1.2.3, 2.0.0)
+    1.2.x ----> [1.2.0, 1.3.0)
+    1.2.3 - 2.4.6 ----> [1.2.3, 2.4.6]
+
+    Also supports ruby (`~> 1.2`, `>= 1.0, < 2.0`) and composer style
+    ranges. Bare partial versions (`1.2`) are exact versions.
     :param semver: str
     :return: VersionRange
     """
-    operators = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
-
     if is_unified_range(semver):
         raise ValueError(
             "Version ranges seems to already be maven version range")
-    if not any(op in semver for op in operators.values()):
-        semver = _clean_semver(semver)
+
+    clock = instrumentation.start("create_from_semver")
+    rng = _from_comparators(lex_semver(semver))
+    if clock is not None:
+        clock.done(restrictions=len(rng.restrictions))
+    return rng
+
+
+def create_from_range(spec: str) -> UnifiedVersionRange:
+    """
+    Create UnifiedVersionRange from a semver or unified range string.
+    The string is classified and lexed once (see `dialects.classify`) and
+    the range is built from its tokens. Exact versions are rejected -
+    `1.0` is an exact npm version but includes all the versions as a
+    maven range.
+    :param spec: str
+    :return: VersionRange
+    """
+    clock = instrumentation.start("create_from_range")
+    dialect, tokens = classify(spec)
+    if dialect == MAVEN:
+        rng = UnifiedVersionRange._from_tokens(tokens)
+    elif dialect == EXACT:
+        raise ValueError(
+            f'Not a valid semver or unified/maven range - ({spec})')
     else:
-        semver = _comparator_trim(semver)
+        rng = _from_comparators(tokens)
+    if clock is not None:
+        clock.done(restrictions=len(rng.restrictions))
+    return rng
 
-    if semver == "*":
-        return UnifiedVersionRange(None, [Restriction.all_versions()])
-    semver_restrictions = semver.split("||")
 
+def _from_comparators(alternatives: Comparators) -> UnifiedVersionRange:
+    """
+    Create UnifiedVersionRange from the comparators of `dialects.lex_semver`.
+    """
     restrictions = []
-    for semver_restriction in semver_restrictions:
-        constraints = semver_restriction.split()
+    for comparators in alternatives:
         lower_bound = None
         has_inclusive_lower = False
         upper_bound = None
         has_inclusive_upper = False
-        for constraint in constraints:
-            if constraint.count("<") > 1 or constraint.count(">") > 1:
-                raise ValueError("semver range contains </> more than one time.")
-            if constraint.startswith(operators["lte"]):
-                upper_bound = constraint[2:]
-                has_inclusive_upper = True
-            elif constraint.startswith(operators["gte"]):
-                lower_bound = constraint[2:]
-                has_inclusive_lower = True
-            elif constraint.startswith(operators["lt"]):
-                upper_bound = constraint[1:]
-
-            elif constraint.startswith(operators["gt"]):
-                lower_bound = constraint[1:]
+        for i, (op, version) in enumerate(comparators):
+            if op == "--":
+                continue
+            if op == "-":
+                lower, upper = _hyphen_bounds(version, comparators[i + 1][1])
             else:
-                upper_bound = constraint
-                lower_bound = constraint
-                has_inclusive_lower = True
-                has_inclusive_upper = True
-
-        lower_version = Version(None)
-        upper_version = Version(None)
-        if lower_bound:
-            lower_version = Version(lower_bound)
-        if upper_bound:
-            upper_version = Version(upper_bound)
-        restrictions.append(
-            Restriction(lower_version, has_inclusive_lower, upper_version, has_inclusive_upper))
+                lower, upper = _comparator_bounds(op, version)
+            if lower is not None:
+                lower_bound, has_inclusive_lower = lower
+            if upper is not None:
+                upper_bound, has_inclusive_upper = upper
 
+        restrictions.append(
+            Restriction(Version(lower_bound or None), has_inclusive_lower,
+                        Version(upper_bound or None), has_inclusive_upper))
     return UnifiedVersionRange(None, restrictions)
 
 
-def not_included_versions(ordered_version_list: List[str],
-                          ranges_list: List[UnifiedVersionRange]) -> List[str]:
+def _merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
     """
-    Filter versions that are not included in the ranges.
-    Versions list must be ordered to filter correctly.
-    :param ordered_version_list:
-    :param ranges_list:
-    :return:
+    Sort and coalesce half-open `[start, end)` index intervals.
+    Empty intervals are dropped, overlapping or adjacent ones are merged.
+    :param intervals: list of (start, end) tuples
+    :return: sorted list of disjoint (start, end) tuples
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _index_intervals(version_index: VersionIndex,
+                     ranges_list: List[UnifiedVersionRange]) \
+        -> Optional[List[Tuple[int, int]]]:
+    """
+    Return the half-open `[start, end)` slices of version_index that are
+    included in the ranges (not merged, possibly empty), or None if a
+    restriction includes all the versions.
     """
 
-    def _get_index(ver_lst: List[str], ver: Optional[str],
-                   include: bool = False) -> int:
+    def _get_index(ver: Optional[str], include: bool = False) -> int:
         """
-        get index of item in list
+        get index of version in version_index
         """
         if ver is None:
             return
 
-        if ver in ver_lst:
-            # only first one that found
-            ret = ver_lst.index(ver)
-        else:
+        ret = version_index.position(ver)
+        if ret is None:
             raise ValueError(
-                f"Version {ver} couldn't be found in the versions list {ver_lst}")
+                f"Version {ver} couldn't be found in the versions list {version_index}")
 
         if include:
             ret = ret + 1
         return ret
 
-    # FIXME: Can be set?
-    rst_indices: List[set] = []
-    last_index = len(ordered_version_list)
+    # every restriction is kept as a slice of the ordered versions,
+    # instead of materializing the indices it covers.
+    intervals: List[Tuple[int, int]] = []
+    last_index = len(version_index)
     first_index = 0
-    # FIXME: remove operators
     for rng in ranges_list:
         # calculate index of the ordered_version_list slices
         # using new property `constraints` isn't necessary
@@ -219,34 +377,266 @@ def not_included_versions(ordered_version_list: List[str],
             if lower == upper:
                 if not lower.version and not upper.version:
                     # (,) [,] - all version included
-                    return []
+                    return None
                 # Exact version range - `[VER]`
                 # lower or upper versions can be taken, and inclusive set to false
                 # to get the right index.
-                exact_index = _get_index(ordered_version_list, lower.version)
-                # exact index to be removed is added as a set to rst_indices
-                rst_indices.append(set((exact_index,)))
+                exact_index = _get_index(lower.version)
+                intervals.append((exact_index, exact_index + 1))
                 continue
-            lower_index = _get_index(ordered_version_list, lower.version,
-                                     not lower.inclusive)
-            upper_index = _get_index(ordered_version_list, upper.version,
-                                     upper.inclusive)
-            # use of on the list and intersection .. [:]
+            lower_index = _get_index(lower.version, not lower.inclusive)
+            upper_index = _get_index(upper.version, upper.inclusive)
             # [X,Y]
             if lower_index is not None and upper_index is not None:
-                rst_indices.append(set(range(lower_index, upper_index)))
+                intervals.append((lower_index, upper_index))
             # [X,]
             elif lower_index is not None and upper_index is None:
-                rst_indices.append(set(range(lower_index, last_index)))
+                intervals.append((lower_index, last_index))
             # [,Y]
             elif lower_index is None and upper_index is not None:
-                rst_indices.append(set(range(first_index, upper_index)))
+                intervals.append((first_index, upper_index))
+    return intervals
+
+
+# the compiled kernels, when they are built (see `unified_range.speedups`)
+_merge_intervals = speedups.kernel("merge_intervals", _merge_intervals)
+_index_intervals = speedups.kernel("index_intervals", _index_intervals)
+
+
+def _use_numpy(backend: Optional[str], intervals_count: int) -> bool:
+    if backend is None:
+        return numpy is not None and intervals_count >= NUMPY_MIN_INTERVALS
+    if backend == "numpy":
+        if numpy is None:
+            raise ValueError("numpy backend requires numpy to be installed")
+        return True
+    if backend == "python":
+        return False
+    raise ValueError(f"Unknown backend: {backend}")
 
-    if rst_indices:
-        ind_to_remove = set.union(*rst_indices)
-    else:
-        ind_to_remove = []
 
-    not_included = [v for i, v in enumerate(ordered_version_list) if
-                    i not in ind_to_remove]
+def _numpy_not_included_mask(versions_count: int,
+                             intervals: List[Tuple[int, int]]):
+    """
+    Coverage of the intervals with a difference array and cumsum,
+    returns a boolean array that is True for versions not included.
+    """
+    bounds = numpy.array(intervals, dtype=numpy.int64).reshape(-1, 2)
+    bounds = bounds[bounds[:, 0] < bounds[:, 1]]
+    diff = numpy.zeros(versions_count + 1, dtype=numpy.int64)
+    numpy.add.at(diff, bounds[:, 0], 1)
+    numpy.add.at(diff, bounds[:, 1], -1)
+    return numpy.cumsum(diff[:-1]) == 0
+
+
+def not_included_mask(ordered_version_list: Union[List[str], VersionIndex],
+                      ranges_list: List[UnifiedVersionRange],
+                      backend: Optional[str] = None):
+    """
+    Same as `not_included_versions`, but return a mask aligned with the
+    ordered versions that is True for versions not included in the ranges.
+    :return: numpy bool array with the numpy backend, list of bool otherwise
+    """
+    version_index = VersionIndex.of(ordered_version_list)
+    versions_count = len(version_index)
+    intervals = _index_intervals(version_index, ranges_list)
+    use_numpy = _use_numpy(backend, len(intervals or ()))
+    if intervals is None:
+        if use_numpy:
+            return numpy.zeros(versions_count, dtype=bool)
+        return [False] * versions_count
+    if use_numpy:
+        return _numpy_not_included_mask(versions_count, intervals)
+    mask = [True] * versions_count
+    for start, end in _merge_intervals(intervals):
+        mask[start:end] = [False] * (end - start)
+    return mask
+
+
+def not_included_versions(ordered_version_list: Union[List[str], VersionIndex],
+                          ranges_list: List[UnifiedVersionRange],
+                          backend: Optional[str] = None) -> List[str]:
+    """
+    Filter versions that are not included in the ranges.
+    Versions list must be ordered to filter correctly.
+    :param ordered_version_list: list of versions or VersionIndex
+    :param ranges_list:
+    :param backend: "numpy" or "python". By default numpy is used when it
+        is installed and there are at least NUMPY_MIN_INTERVALS restrictions.
+    :return:
+    """
+    clock = instrumentation.start("not_included_versions")
+    version_index = VersionIndex.of(ordered_version_list)
+    versions = version_index.versions
+    if clock is not None:
+        clock.stage("index")
+    intervals = _index_intervals(version_index, ranges_list)
+    if clock is not None:
+        clock.stage("lookup")
+    if intervals is None:
+        not_included: List[str] = []
+    elif _use_numpy(backend, len(intervals)):
+        mask = _numpy_not_included_mask(len(versions), intervals)
+        if clock is not None:
+            clock.stage("intervals")
+        not_included = [versions[i]
+                        for i in numpy.flatnonzero(mask).tolist()]
+    else:
+        merged = _merge_intervals(intervals)
+        if clock is not None:
+            clock.stage("intervals")
+        not_included = []
+        previous_end = 0
+        for start, end in merged:
+            not_included.extend(versions[previous_end:start])
+            previous_end = end
+        not_included.extend(versions[previous_end:])
+    if clock is not None:
+        clock.stage("output")
+        clock.done(versions=len(versions), intervals=len(intervals or ()))
     return not_included
+
+
+def next_not_included_version(ordered_version_list: Union[List[str],
+                                                          VersionIndex],
+                              ranges_list: List[UnifiedVersionRange],
+                              current_version: str) -> Optional[str]:
+    """
+    Return the first version, from current_version onwards, that is not
+    included in the ranges, or None. Searches forward from current_version
+    over the merged restriction slices, without filtering all the versions.
+    :param ordered_version_list: list of versions or VersionIndex
+    :param ranges_list:
+    :param current_version: version from ordered_version_list
+    :return: version or None
+    """
+    version_index = VersionIndex.of(ordered_version_list)
+    current_index = version_index.position(current_version)
+    intervals = _index_intervals(version_index, ranges_list)
+    if intervals is None:
+        return None
+    merged = _merge_intervals(intervals)
+    versions_count = len(version_index)
+    # the last slice that starts at or before the current version
+    i = bisect_right(merged, (current_index, versions_count)) - 1
+    index = current_index
+    while index < versions_count:
+        if i >= 0 and index < merged[i][1]:
+            # included, skip to the end of the slice
+            index = merged[i][1]
+            continue
+        if i + 1 < len(merged) and merged[i + 1][0] <= index:
+            i += 1
+            continue
+        version = version_index[index]
+        # a repeated version is positioned at its first occurrence
+        if version_index.position(version) >= current_index:
+            return version
+        index += 1
+    return None
+
+
+def last_not_included_version(ordered_version_list: Union[List[str],
+                                                          VersionIndex],
+                              ranges_list: List[UnifiedVersionRange]) \
+        -> Optional[str]:
+    """
+    Return the last version that is not included in the ranges, or None.
+    Searches backward from the end over the merged restriction slices.
+    :param ordered_version_list: list of versions or VersionIndex
+    :param ranges_list:
+    :return: version or None
+    """
+    version_index = VersionIndex.of(ordered_version_list)
+    intervals = _index_intervals(version_index, ranges_list)
+    if intervals is None:
+        return None
+    index = len(version_index) - 1
+    for start, end in reversed(_merge_intervals(intervals)):
+        if index >= end:
+            break
+        index = min(index, start - 1)
+    if index < 0:
+        return None
+    return version_index[index]
+
+
+# restriction states while streaming versions
+_PENDING, _ACTIVE, _DONE = range(3)
+
+
+def iter_not_included_versions(ordered_versions: Iterable[str],
+                               ranges_list: List[UnifiedVersionRange]) \
+        -> Iterator[str]:
+    """
+    Lazy `not_included_versions` over an iterable of ordered versions (e.g.
+    a DB cursor). Versions are consumed one by one and memory is bound by
+    the number of restrictions, not versions.
+    Bounds that are missing from the versions raise ValueError once the
+    versions are exhausted.
+    :param ordered_versions: iterable of ordered versions
+    :param ranges_list:
+    :return: iterator of the versions not included in the ranges
+    """
+    # bound version -> events to apply before and after the version is
+    # checked, an event is (restriction number, starts restriction).
+    events: Dict[str, Tuple[list, list]] = {}
+    states: List[int] = []
+
+    def _add_event(version: str, before: bool, event: Tuple[int, bool]):
+        before_events, after_events = events.setdefault(version, ([], []))
+        (before_events if before else after_events).append(event)
+
+    for rng in ranges_list:
+        for rst in rng.constraints:
+            lower, upper = rst.bounds
+            number = len(states)
+            if lower == upper:
+                if lower.version is None:
+                    # (,) - all versions included
+                    return
+                # Exact version range - `[VER]`
+                states.append(_PENDING)
+                _add_event(lower.version, True, (number, True))
+                _add_event(lower.version, False, (number, False))
+                continue
+            if lower.version is None and upper.version is None:
+                continue
+            if lower.version is None:
+                states.append(_ACTIVE)
+            else:
+                states.append(_PENDING)
+                _add_event(lower.version, lower.inclusive, (number, True))
+            if upper.version is not None:
+                _add_event(upper.version, not upper.inclusive, (number, False))
+
+    active = states.count(_ACTIVE)
+
+    def _apply(version_events: list) -> int:
+        """
+        Apply events, return the change in the active restrictions count.
+        """
+        change = 0
+        for number, starts in version_events:
+            state = states[number]
+            if starts and state == _PENDING:
+                states[number] = _ACTIVE
+                change += 1
+            elif not starts and state != _DONE:
+                # an upper bound before the lower one - empty restriction
+                states[number] = _DONE
+                change -= state == _ACTIVE
+        return change
+
+    for version in ordered_versions:
+        # only first one that found, same as `list.index`
+        version_events = events.pop(version, None)
+        if version_events is not None:
+            active += _apply(version_events[0])
+        if not active:
+            yield version
+        if version_events is not None:
+            active += _apply(version_events[1])
+    if events:
+        raise ValueError(
+            f"Version {next(iter(events))} couldn't be found in the versions list")